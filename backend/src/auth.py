@@ -8,9 +8,14 @@ Handles user authentication with:
 - Session management via secure cookies
 """
 
+import re
 import uuid
+import hmac
 import secrets
+import hashlib
 import logging
+import threading
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
@@ -27,6 +32,11 @@ config = load_config()
 SESSION_COOKIE_NAME = "arena_session"
 SESSION_DURATION_DAYS = 30
 
+# Process-wide session token -> User cache (keys are SHA-256 digests of tokens).
+# Entries also hold the user's serialized JSON for /v1/auth/me polling.
+SESSION_CACHE_TTL_SECONDS = 30
+SESSION_CACHE_MAX_ENTRIES = 10_000
+
 
 class User(BaseModel):
     """User model for API responses."""
@@ -38,6 +48,13 @@ class User(BaseModel):
     is_email_verified: bool = False
 
 
+class AuthUserResponse(BaseModel):
+    """Response body for endpoints that return the authenticated user (login, register)."""
+    protocol_version: str = "arena/v0"
+    message: str
+    user: User
+
+
 class DevLoginRequest(BaseModel):
     """Request for dev login (testing only)."""
     email: str = "test@example.com"
@@ -71,10 +88,78 @@ def generate_session_token() -> str:
 MIN_PASSWORD_LENGTH = 8
 
 
+# bcrypt cost: calibrated at startup to the slowest cost that stays within
+# PASSWORD_HASH_BUDGET_MS on this machine (ARENA_BCRYPT_ROUNDS pins it instead)
+PASSWORD_HASH_BUDGET_MS = 250
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 14
+_bcrypt_rounds = 12  # bcrypt's own default until calibrated
+
+
+def calibrate_password_hashing(budget_ms: float = PASSWORD_HASH_BUDGET_MS) -> int:
+    """
+    Pick the bcrypt cost used by hash_password.
+    
+    Times one hash at BCRYPT_MIN_ROUNDS and extrapolates (each extra round
+    doubles the work) to the highest cost that fits the budget, clamped to
+    [BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS].
+    
+    Returns:
+        The selected number of rounds
+    """
+    global _bcrypt_rounds, _dummy_password_hash
+    import bcrypt
+    
+    if config.bcrypt_rounds:
+        rounds = max(4, min(31, config.bcrypt_rounds))
+    else:
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=BCRYPT_MIN_ROUNDS))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        rounds = BCRYPT_MIN_ROUNDS
+        while rounds < BCRYPT_MAX_ROUNDS and elapsed_ms * 2 ** (rounds + 1 - BCRYPT_MIN_ROUNDS) <= budget_ms:
+            rounds += 1
+    
+    _bcrypt_rounds = rounds
+    # Hashed here at the new cost, so no login request pays for it
+    _dummy_password_hash = hash_password(secrets.token_urlsafe(16))
+    logger.info("Password hashing: bcrypt rounds=%s", rounds)
+    return rounds
+
+
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
     import bcrypt
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=_bcrypt_rounds)).decode('utf-8')
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """
+    Check whether a stored bcrypt hash uses a lower cost than the current one.
+    
+    Stronger hashes are never downgraded.
+    """
+    try:
+        return int(password_hash.split("$")[2]) < _bcrypt_rounds
+    except (IndexError, ValueError):
+        return False
+
+
+_dummy_password_hash: Optional[str] = None
+
+
+def get_dummy_password_hash() -> str:
+    """
+    Return a bcrypt hash of a random throwaway password.
+    
+    Login verifies against this hash when the account is unknown (or has no
+    password), so those requests cost the same bcrypt work as a real check
+    and response timing does not reveal which emails are registered.
+    Computed by calibrate_password_hashing at startup, so the first unknown
+    email costs the same as any other login.
+    """
+    return _dummy_password_hash
 
 
 def verify_password(password: str, password_hash: str) -> bool:
@@ -86,6 +171,16 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+# Email format: one "@", no whitespace, a dot in the domain (RFC 5321 length cap)
+EMAIL_PATTERN = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+MAX_EMAIL_LENGTH = 254
+
+
+def is_valid_email(email: str) -> bool:
+    """Check that an email address is plausibly well-formed (no DNS/MX lookup)."""
+    return bool(email) and len(email) <= MAX_EMAIL_LENGTH and EMAIL_PATTERN.fullmatch(email) is not None
+
+
 def validate_password(password: str) -> tuple[bool, str]:
     """
     Validate password meets requirements.
@@ -121,6 +216,9 @@ def create_user(email: str, display_name: str, google_sub: Optional[str] = None,
     now_utc = datetime.now(timezone.utc).isoformat()
     user_id = f"u_{uuid.uuid4().hex[:16]}"
     
+    # Emails are stored lower-cased so lookups can use the plain UNIQUE index
+    email = email.strip().lower()
+    
     try:
         with transaction() as cursor:
             # Google users are auto-verified (Google has verified their email)
@@ -133,7 +231,7 @@ def create_user(email: str, display_name: str, google_sub: Optional[str] = None,
                 (user_id, email, google_sub, display_name, password_hash, is_verified, now_utc, now_utc)
             )
         
-        logger.info(f"Created new user: user_id={user_id} email={email}")
+        logger.info("Created new user: user_id=%s email=%s", user_id, email)
         
         return User(
             user_id=user_id,
@@ -144,10 +242,60 @@ def create_user(email: str, display_name: str, google_sub: Optional[str] = None,
             is_email_verified=(google_sub is not None)  # Google users are auto-verified
         )
     except Exception as e:
-        logger.error(f"Failed to create user: {e}")
+        logger.error("Failed to create user: %s", e)
         raise
 
 
+def upsert_google_user(email: str, display_name: str, google_sub: str) -> tuple[User, bool]:
+    """
+    Create a Google user, or link Google to an existing account with the same email.
+    
+    A single INSERT ... ON CONFLICT(email) DO UPDATE ... RETURNING handles both
+    cases atomically, so concurrent first logins cannot race to create the
+    same user. Existing accounts keep their display name and any previously
+    linked google_sub; last_login_utc is refreshed and the email is marked
+    verified (Google has verified it).
+    
+    Returns:
+        Tuple of (user, created) where created is True for a new account.
+    """
+    now_utc = datetime.now(timezone.utc).isoformat()
+    user_id = f"u_{uuid.uuid4().hex[:16]}"
+    email = email.strip().lower()
+    
+    with transaction() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO users (user_id, email, google_sub, display_name, password_hash, is_email_verified, created_at_utc, last_login_utc)
+            VALUES (?, ?, ?, ?, NULL, 1, ?, ?)
+            ON CONFLICT(email) DO UPDATE SET
+                google_sub = COALESCE(users.google_sub, excluded.google_sub),
+                is_email_verified = 1,
+                last_login_utc = excluded.last_login_utc
+            RETURNING user_id, email, display_name, created_at_utc, last_login_utc, is_email_verified
+            """,
+            (user_id, email, google_sub, display_name, now_utc, now_utc)
+        )
+        row = cursor.fetchall()[0]
+    
+    user = User(
+        user_id=row["user_id"],
+        email=row["email"],
+        display_name=row["display_name"],
+        created_at_utc=row["created_at_utc"],
+        last_login_utc=row["last_login_utc"],
+        is_email_verified=bool(row["is_email_verified"])
+    )
+    created = user.user_id == user_id
+    
+    if created:
+        logger.info("Created new user: user_id=%s email=%s", user_id, email)
+    else:
+        invalidate_user_sessions_cache(user.user_id)
+    
+    return user, created
+
+
 def get_password_hash_by_email(email: str) -> Optional[str]:
     """Get the password hash for a user by email."""
     conn = get_connection()
@@ -188,6 +336,35 @@ def get_user_by_email(email: str) -> Optional[User]:
     return None
 
 
+def get_user_with_password_hash_by_email(email: str) -> tuple[Optional[User], Optional[str]]:
+    """
+    Get a user and their password hash by email in a single query.
+    
+    Returns:
+        Tuple of (user, password_hash). user is None if no account exists;
+        password_hash is None for OAuth-only accounts.
+    """
+    conn = get_connection()
+    cursor = conn.execute(
+        "SELECT user_id, email, display_name, created_at_utc, last_login_utc, is_email_verified, password_hash FROM users WHERE email = ?",
+        (email,)
+    )
+    row = cursor.fetchone()
+    
+    if not row:
+        return None, None
+    
+    user = User(
+        user_id=row["user_id"],
+        email=row["email"],
+        display_name=row["display_name"],
+        created_at_utc=row["created_at_utc"],
+        last_login_utc=row["last_login_utc"],
+        is_email_verified=bool(row["is_email_verified"])
+    )
+    return user, row["password_hash"] or None
+
+
 def get_user_by_google_sub(google_sub: str) -> Optional[User]:
     """Get a user by Google subject ID."""
     conn = get_connection()
@@ -240,6 +417,8 @@ def update_last_login(user_id: str) -> None:
             "UPDATE users SET last_login_utc = ? WHERE user_id = ?",
             (now_utc, user_id)
         )
+    
+    invalidate_user_sessions_cache(user_id)
 
 
 def mark_email_verified(user_id: str) -> None:
@@ -249,7 +428,8 @@ def mark_email_verified(user_id: str) -> None:
             "UPDATE users SET is_email_verified = 1 WHERE user_id = ?",
             (user_id,)
         )
-    logger.info(f"Marked email as verified for user {user_id}")
+    invalidate_user_sessions_cache(user_id)
+    logger.info("Marked email as verified for user %s", user_id)
 
 
 def create_session(user_id: str) -> str:
@@ -273,17 +453,147 @@ def create_session(user_id: str) -> str:
             INSERT INTO user_sessions (session_token, user_id, created_at_utc, expires_at_utc)
             VALUES (?, ?, ?, ?)
             """,
-            (session_token, user_id, now_utc, expires_at)
+            (hash_session_token(session_token), user_id, now_utc, expires_at)
         )
     
-    logger.debug(f"Created session for user {user_id}")
+    logger.debug("Created session for user %s", user_id)
     return session_token
 
 
+_session_user_cache: dict[bytes, tuple[float, "User", bytes]] = {}
+_session_user_cache_lock = threading.Lock()
+
+
+def _session_cache_key(session_token: str) -> bytes:
+    """Cache key for a session token (the raw token is never kept in memory)."""
+    return hashlib.sha256(session_token.encode("utf-8")).digest()
+
+
+def hash_session_token(session_token: str) -> str:
+    """
+    SHA-256 hex digest of a session token.
+    
+    This is what user_sessions.session_token stores; the raw token only lives
+    in the client's cookie, so a leaked database does not expose live sessions.
+    """
+    return hashlib.sha256(session_token.encode("utf-8")).hexdigest()
+
+
+def _cache_session_user(key: bytes, user: "User", session_expires_at: str) -> None:
+    """Cache a resolved user until the TTL or the session expiry, whichever is first."""
+    now = time.monotonic()
+    try:
+        seconds_left = (datetime.fromisoformat(session_expires_at) - datetime.now(timezone.utc)).total_seconds()
+    except (TypeError, ValueError):
+        return
+    expires_at = now + min(SESSION_CACHE_TTL_SECONDS, seconds_left)
+    user_json = user.model_dump_json().encode("utf-8")
+    
+    with _session_user_cache_lock:
+        if len(_session_user_cache) >= SESSION_CACHE_MAX_ENTRIES:
+            # Drop expired entries first, then the oldest insertions
+            for stale_key in [k for k, (exp, _, _) in _session_user_cache.items() if exp <= now]:
+                del _session_user_cache[stale_key]
+            while len(_session_user_cache) >= SESSION_CACHE_MAX_ENTRIES:
+                del _session_user_cache[next(iter(_session_user_cache))]
+        _session_user_cache[key] = (expires_at, user, user_json)
+
+
+def invalidate_user_sessions_cache(user_id: str) -> None:
+    """Drop every cached session for a user (after the user record changes or is deleted)."""
+    with _session_user_cache_lock:
+        for key in [k for k, (_, u, _) in _session_user_cache.items() if u.user_id == user_id]:
+            del _session_user_cache[key]
+
+
+def login_user(user_id: str, mark_verified: bool = False) -> str:
+    """
+    Record a login for an existing user and open a new session.
+    
+    Updates last_login_utc (and optionally marks the email as verified) and
+    creates the session in a single transaction, replacing separate
+    update_last_login / mark_email_verified / create_session commits.
+    
+    Args:
+        user_id: The user's ID
+        mark_verified: Also set is_email_verified (e.g. Google login)
+    
+    Returns:
+        The session token
+    """
+    now_utc = datetime.now(timezone.utc).isoformat()
+    expires_at = get_session_expiry()
+    session_token = generate_session_token()
+    
+    with transaction() as cursor:
+        cursor.execute(
+            """
+            UPDATE users
+            SET last_login_utc = ?, is_email_verified = MAX(is_email_verified, ?)
+            WHERE user_id = ?
+            """,
+            (now_utc, 1 if mark_verified else 0, user_id)
+        )
+        cursor.execute(
+            """
+            INSERT INTO user_sessions (session_token, user_id, created_at_utc, expires_at_utc)
+            VALUES (?, ?, ?, ?)
+            """,
+            (hash_session_token(session_token), user_id, now_utc, expires_at)
+        )
+    
+    # Other cached sessions of this user now have a stale last_login_utc
+    invalidate_user_sessions_cache(user_id)
+    
+    logger.debug("Created session for user %s", user_id)
+    return session_token
+
+
+def _get_cached_session(session_token: str) -> Optional[tuple[float, "User", bytes]]:
+    """Return the live cache entry for a session token, dropping it if expired."""
+    key = _session_cache_key(session_token)
+    cached = _session_user_cache.get(key)
+    if cached is None:
+        return None
+    if cached[0] > time.monotonic():
+        return cached
+    with _session_user_cache_lock:
+        _session_user_cache.pop(key, None)
+    return None
+
+
+def get_session_user_json(session_token: str) -> Optional[bytes]:
+    """
+    Get the serialized JSON of the user behind a session token.
+    
+    Served from the session cache when possible, so repeated /v1/auth/me
+    polls skip both the DB lookup and the JSON encoding.
+    
+    Returns:
+        UTF-8 JSON bytes of the User, or None if the session is invalid
+    """
+    if not session_token:
+        return None
+    
+    cached = _get_cached_session(session_token)
+    if cached is not None:
+        return cached[2]
+    
+    user = get_user_from_session(session_token)
+    if user is None:
+        return None
+    
+    cached = _get_cached_session(session_token)
+    return cached[2] if cached is not None else user.model_dump_json().encode("utf-8")
+
+
 def get_user_from_session(session_token: str) -> Optional[User]:
     """
     Get the user associated with a session token.
     
+    Valid sessions are cached in-process for up to SESSION_CACHE_TTL_SECONDS
+    (never past the session's own expiry). Invalid tokens are not cached.
+    
     Args:
         session_token: The session token from cookie
     
@@ -293,22 +603,27 @@ def get_user_from_session(session_token: str) -> Optional[User]:
     if not session_token:
         return None
     
+    cached = _get_cached_session(session_token)
+    if cached is not None:
+        return cached[1]
+    
     conn = get_connection()
     now_utc = datetime.now(timezone.utc).isoformat()
     
     cursor = conn.execute(
         """
-        SELECT u.user_id, u.email, u.display_name, u.created_at_utc, u.last_login_utc, u.is_email_verified
+        SELECT u.user_id, u.email, u.display_name, u.created_at_utc, u.last_login_utc, u.is_email_verified,
+               s.expires_at_utc
         FROM user_sessions s
         JOIN users u ON s.user_id = u.user_id
         WHERE s.session_token = ? AND s.expires_at_utc > ?
         """,
-        (session_token, now_utc)
+        (hash_session_token(session_token), now_utc)
     )
     row = cursor.fetchone()
     
     if row:
-        return User(
+        user = User(
             user_id=row["user_id"],
             email=row["email"],
             display_name=row["display_name"],
@@ -316,6 +631,8 @@ def get_user_from_session(session_token: str) -> Optional[User]:
             last_login_utc=row["last_login_utc"],
             is_email_verified=bool(row["is_email_verified"])
         )
+        _cache_session_user(_session_cache_key(session_token), user, row["expires_at_utc"])
+        return user
     return None
 
 
@@ -326,8 +643,39 @@ def delete_session(session_token: str) -> None:
     with transaction() as cursor:
         cursor.execute(
             "DELETE FROM user_sessions WHERE session_token = ?",
-            (session_token,)
+            (hash_session_token(session_token),)
+        )
+    
+    with _session_user_cache_lock:
+        _session_user_cache.pop(_session_cache_key(session_token), None)
+
+
+def hash_legacy_sessions() -> int:
+    """
+    Replace raw session tokens left from before tokens were hashed.
+    
+    A raw token (43 URL-safe characters) is never 64 characters long, unlike
+    its hex digest, so already-hashed rows are skipped. Runs at startup;
+    SQLite has no built-in SHA-256, so this cannot be a SQL migration.
+    Returns count of re-keyed sessions.
+    """
+    conn = get_connection()
+    
+    cursor = conn.execute(
+        "SELECT session_token FROM user_sessions WHERE length(session_token) != 64"
+    )
+    legacy_tokens = [row[0] for row in cursor.fetchall()]
+    if not legacy_tokens:
+        return 0
+    
+    with transaction() as cursor:
+        cursor.executemany(
+            "UPDATE user_sessions SET session_token = ? WHERE session_token = ?",
+            [(hash_session_token(token), token) for token in legacy_tokens]
         )
+    
+    logger.info("Hashed %s legacy session token(s)", len(legacy_tokens))
+    return len(legacy_tokens)
 
 
 def cleanup_expired_sessions() -> int:
@@ -343,7 +691,7 @@ def cleanup_expired_sessions() -> int:
         count = cursor.rowcount
     
     if count > 0:
-        logger.info(f"Cleaned up {count} expired session(s)")
+        logger.info("Cleaned up %s expired session(s)", count)
     
     return count
 
@@ -352,17 +700,25 @@ def get_current_user(request: Request) -> Optional[User]:
     """
     Get the current user from the request cookies.
     
+    The resolved user is memoized on request.state, so helpers like
+    require_auth and Depends(get_current_user) in the same request share a
+    single session lookup.
+    
     Args:
         request: FastAPI request object
     
     Returns:
         User if authenticated, None otherwise
     """
+    state = request.state
+    if hasattr(state, "current_user"):
+        return state.current_user
+    
     session_token = request.cookies.get(SESSION_COOKIE_NAME)
-    if not session_token:
-        return None
+    user = get_user_from_session(session_token) if session_token else None
     
-    return get_user_from_session(session_token)
+    state.current_user = user
+    return user
 
 
 def set_session_cookie(response: Response, session_token: str) -> None:
@@ -386,12 +742,63 @@ def clear_session_cookie(response: Response) -> None:
 
 
 # Google OAuth verification
+# Google's PEM signing certs (rotated every few days; max-age in Cache-Control)
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS = 3600
+
+# Verified-token cache: repeat logins with the same credential (page reloads,
+# multiple tabs) skip signature verification
+GOOGLE_TOKEN_CACHE_TTL_SECONDS = 60
+GOOGLE_TOKEN_CACHE_MAX_ENTRIES = 2048
+
+_google_certs: Optional[dict] = None
+_google_certs_expires_at = 0.0
+_google_certs_lock = threading.Lock()
+_google_http_session = None
+
+_google_token_cache: dict[bytes, tuple[float, dict]] = {}
+_google_token_cache_lock = threading.Lock()
+
+
+def _get_google_certs(force_refresh: bool = False) -> dict:
+    """
+    Get Google's token signing certs, cached for the Cache-Control max-age.
+    
+    Args:
+        force_refresh: Ignore the cached copy (e.g. after an unknown key id)
+    """
+    global _google_certs, _google_certs_expires_at, _google_http_session
+    
+    with _google_certs_lock:
+        now = time.monotonic()
+        if not force_refresh and _google_certs is not None and now < _google_certs_expires_at:
+            return _google_certs
+        
+        if _google_http_session is None:
+            import requests
+            _google_http_session = requests.Session()
+        
+        resp = _google_http_session.get(GOOGLE_CERTS_URL, timeout=10)
+        resp.raise_for_status()
+        
+        max_age = GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS
+        for directive in resp.headers.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name.lower() == "max-age" and value.isdigit():
+                max_age = int(value)
+        
+        _google_certs = resp.json()
+        _google_certs_expires_at = now + max_age
+        return _google_certs
+
+
 def verify_google_token(credential: str) -> Optional[dict]:
     """
     Verify a Google ID token and extract user info.
     
-    Uses Google's official library to verify the JWT signature,
-    check expiration, and validate the audience (client ID).
+    Checks the JWT signature against Google's (cached) signing certs, plus
+    expiration, audience (client ID) and issuer. Successful results are
+    cached for up to GOOGLE_TOKEN_CACHE_TTL_SECONDS, never past token expiry.
     
     Args:
         credential: The Google ID token (JWT from frontend)
@@ -403,26 +810,35 @@ def verify_google_token(credential: str) -> Optional[dict]:
         logger.error("Google OAuth not configured: ARENA_GOOGLE_CLIENT_ID not set")
         return None
     
-    logger.info(f"Verifying Google token with client_id: {config.google_client_id[:20]}...")
+    cache_key = hashlib.sha256(credential.encode("utf-8")).digest()
+    cached = _google_token_cache.get(cache_key)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            return dict(cached[1])
+        with _google_token_cache_lock:
+            _google_token_cache.pop(cache_key, None)
+    
+    logger.info("Verifying Google token with client_id: %s...", config.google_client_id[:20])
     
     try:
-        from google.oauth2 import id_token
-        from google.auth.transport import requests as google_requests
+        from google.auth import jwt
         
-        # Verify the token with Google's servers
-        # This checks: signature, expiration, audience, and issuer
-        idinfo = id_token.verify_oauth2_token(
-            credential, 
-            google_requests.Request(), 
-            config.google_client_id
-        )
+        # Verify the token against Google's signing certs
+        # This checks: signature, expiration, and audience (issuer below)
+        try:
+            idinfo = jwt.decode(credential, certs=_get_google_certs(), audience=config.google_client_id)
+        except ValueError as e:
+            # Unknown key id usually means Google rotated its keys; refetch once
+            if "Certificate for key id" not in str(e):
+                raise
+            idinfo = jwt.decode(credential, certs=_get_google_certs(force_refresh=True), audience=config.google_client_id)
         
-        logger.info(f"Token verified. Audience: {idinfo.get('aud', 'unknown')[:20]}...")
+        logger.info("Token verified. Audience: %s...", idinfo.get('aud', 'unknown')[:20])
         
         # Verify the token was issued by Google
         issuer = idinfo.get("iss", "")
         if issuer not in ["accounts.google.com", "https://accounts.google.com"]:
-            logger.warning(f"Invalid token issuer: {issuer}")
+            logger.warning("Invalid token issuer: %s", issuer)
             return None
         
         # Extract user info
@@ -434,20 +850,30 @@ def verify_google_token(credential: str) -> Optional[dict]:
             logger.warning("Token missing required fields (email or sub)")
             return None
         
-        logger.info(f"Google token verified for: {email}")
+        logger.info("Google token verified for: %s", email)
         
-        return {
+        token_info = {
             "email": email,
             "google_sub": google_sub,
             "name": name
         }
         
+        seconds_left = float(idinfo.get("exp", 0)) - time.time()
+        if seconds_left > 0:
+            expires_at = time.monotonic() + min(GOOGLE_TOKEN_CACHE_TTL_SECONDS, seconds_left)
+            with _google_token_cache_lock:
+                while len(_google_token_cache) >= GOOGLE_TOKEN_CACHE_MAX_ENTRIES:
+                    del _google_token_cache[next(iter(_google_token_cache))]
+                _google_token_cache[cache_key] = (expires_at, token_info)
+        
+        return dict(token_info)
+        
     except ValueError as e:
         # Token is invalid (expired, wrong audience, bad signature, etc.)
-        logger.warning(f"Google token verification failed: {e}")
+        logger.warning("Google token verification failed: %s", e)
         return None
     except Exception as e:
-        logger.error(f"Unexpected error verifying Google token: {e}")
+        logger.error("Unexpected error verifying Google token: %s", e)
         return None
 
 
@@ -474,7 +900,7 @@ def create_email_verification_token(user_id: str) -> str:
             (user_id, token, expiry.isoformat(), datetime.now(timezone.utc).isoformat())
         )
     
-    logger.info(f"Created email verification token for user {user_id}")
+    logger.info("Created email verification token for user %s", user_id)
     return token
 
 
@@ -511,12 +937,12 @@ def verify_email_token(token: str) -> Optional[str]:
     
     # Check if already verified
     if verified_at:
-        logger.info(f"Email already verified for user {user_id}")
+        logger.info("Email already verified for user %s", user_id)
         return user_id
     
     # Check if expired
     if now > expires_at:
-        logger.warning(f"Email verification failed: token expired for user {user_id}")
+        logger.warning("Email verification failed: token expired for user %s", user_id)
         return None
     
     # Mark as verified
@@ -542,14 +968,72 @@ def verify_email_token(token: str) -> Optional[str]:
                 (user_id,)
             )
         
-        logger.info(f"Email verified successfully for user {user_id}")
+        # Cached sessions still hold the unverified User
+        invalidate_user_sessions_cache(user_id)
+        
+        logger.info("Email verified successfully for user %s", user_id)
         return user_id
         
     except Exception as e:
-        logger.error(f"Failed to verify email: {e}")
+        logger.error("Failed to verify email: %s", e)
         return None
 
 
+# Per-user cooldown for verification/reset emails: repeated requests within
+# the window are answered with the same success response but send nothing
+EMAIL_SEND_COOLDOWN_SECONDS = 60
+EMAIL_SEND_COOLDOWN_MAX_ENTRIES = 5000
+
+_recent_email_sends: dict[tuple[str, str], float] = {}
+_recent_email_sends_lock = threading.Lock()
+
+
+def claim_email_send(kind: str, user_id: str) -> bool:
+    """
+    Reserve an email send of the given kind for a user.
+    
+    Args:
+        kind: Email type, e.g. "verification" or "password_reset"
+        user_id: Recipient's user ID
+    
+    Returns:
+        True if the caller should send, False if one was sent within
+        EMAIL_SEND_COOLDOWN_SECONDS.
+    """
+    key = (kind, user_id)
+    now = time.monotonic()
+    
+    with _recent_email_sends_lock:
+        sent_at = _recent_email_sends.get(key)
+        if sent_at is not None and now - sent_at < EMAIL_SEND_COOLDOWN_SECONDS:
+            return False
+        
+        if len(_recent_email_sends) >= EMAIL_SEND_COOLDOWN_MAX_ENTRIES:
+            for stale_key in [k for k, t in _recent_email_sends.items() if now - t >= EMAIL_SEND_COOLDOWN_SECONDS]:
+                del _recent_email_sends[stale_key]
+            while len(_recent_email_sends) >= EMAIL_SEND_COOLDOWN_MAX_ENTRIES:
+                del _recent_email_sends[next(iter(_recent_email_sends))]
+        
+        _recent_email_sends[key] = now
+        return True
+
+
+def release_email_send(kind: str, user_id: str) -> None:
+    """Drop a claim made by claim_email_send (e.g. after a failed send) so the user can retry."""
+    with _recent_email_sends_lock:
+        _recent_email_sends.pop((kind, user_id), None)
+
+
+def invalidate_auth_caches() -> None:
+    """Drop every cached session, verified Google token, and email cooldown."""
+    with _session_user_cache_lock:
+        _session_user_cache.clear()
+    with _google_token_cache_lock:
+        _google_token_cache.clear()
+    with _recent_email_sends_lock:
+        _recent_email_sends.clear()
+
+
 def send_verification_email(email: str, token: str) -> bool:
     """
     Send a verification email to the user.
@@ -616,14 +1100,14 @@ def send_verification_email(email: str, token: str) -> bool:
         response = sg.send(message)
         
         if response.status_code >= 200 and response.status_code < 300:
-            logger.info(f"Verification email sent successfully to {email}")
+            logger.info("Verification email sent successfully to %s", email)
             return True
         else:
-            logger.error(f"SendGrid returned status code {response.status_code}")
+            logger.error("SendGrid returned status code %s", response.status_code)
             return False
             
     except Exception as e:
-        logger.error(f"Failed to send verification email: {e}")
+        logger.error("Failed to send verification email: %s", e)
         return False
 
 
@@ -661,7 +1145,7 @@ def create_password_reset_token(user_id: str) -> str:
             (user_id, token, expiry.isoformat(), datetime.now(timezone.utc).isoformat())
         )
     
-    logger.info(f"Created password reset token for user {user_id}")
+    logger.info("Created password reset token for user %s", user_id)
     return token
 
 
@@ -697,12 +1181,12 @@ def verify_password_reset_token(token: str) -> Optional[str]:
     
     # Check if already used
     if used_at:
-        logger.warning(f"Password reset failed: token already used for user {user_id}")
+        logger.warning("Password reset failed: token already used for user %s", user_id)
         return None
     
     # Check if expired
     if now > expires_at:
-        logger.warning(f"Password reset failed: token expired for user {user_id}")
+        logger.warning("Password reset failed: token expired for user %s", user_id)
         return None
     
     return user_id
@@ -727,7 +1211,7 @@ def use_password_reset_token(token: str) -> bool:
             )
         return True
     except Exception as e:
-        logger.error(f"Failed to mark password reset token as used: {e}")
+        logger.error("Failed to mark password reset token as used: %s", e)
         return False
 
 
@@ -748,10 +1232,10 @@ def update_user_password(user_id: str, new_password_hash: str) -> bool:
                 """,
                 (new_password_hash, user_id)
             )
-        logger.info(f"Password updated for user {user_id}")
+        logger.info("Password updated for user %s", user_id)
         return True
     except Exception as e:
-        logger.error(f"Failed to update password: {e}")
+        logger.error("Failed to update password: %s", e)
         return False
 
 
@@ -822,13 +1306,13 @@ def send_password_reset_email(email: str, token: str) -> bool:
         response = sg.send(message)
         
         if response.status_code >= 200 and response.status_code < 300:
-            logger.info(f"Password reset email sent successfully to {email}")
+            logger.info("Password reset email sent successfully to %s", email)
             return True
         else:
-            logger.error(f"SendGrid returned status code {response.status_code}")
+            logger.error("SendGrid returned status code %s", response.status_code)
             return False
             
     except Exception as e:
-        logger.error(f"Failed to send password reset email: {e}")
+        logger.error("Failed to send password reset email: %s", e)
         return False
 
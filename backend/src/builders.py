@@ -11,12 +11,13 @@ Handles generator submission and management for authenticated users:
 
 import uuid
 import json
+import asyncio
 import zipfile
 import io
 import logging
 import re
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import BinaryIO, Optional, List
 
 from fastapi import UploadFile, HTTPException
 from pydantic import BaseModel, Field
@@ -24,6 +25,7 @@ from pydantic import BaseModel, Field
 from config import load_config
 from db import get_connection, transaction
 from db.seed import validate_level, compute_content_hash, LevelValidationError
+from matchmaking import invalidate_matchmaking_cache
 
 logger = logging.getLogger(__name__)
 config = load_config()
@@ -33,6 +35,7 @@ MAX_GENERATORS_PER_USER = 3
 MIN_LEVELS_PER_GENERATOR = 50
 MAX_LEVELS_PER_GENERATOR = 200
 MAX_ZIP_SIZE_BYTES = 10 * 1024 * 1024  # 10 MB
+MAX_LEVEL_FILE_BYTES = 64 * 1024  # Far above MAX_LEVEL_WIDTH x MAX_LEVEL_HEIGHT text
 
 # Generator ID validation pattern (alphanumeric, hyphens, underscores)
 GENERATOR_ID_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]{2,31}$')
@@ -186,23 +189,48 @@ async def process_levels_zip(zip_file: UploadFile) -> List[tuple]:
     Raises:
         BuilderError: If ZIP is invalid or levels fail validation
     """
-    # Read ZIP file content
-    content = await zip_file.read()
-    
-    if len(content) > MAX_ZIP_SIZE_BYTES:
+    # Check the size without reading the upload into memory: Starlette has
+    # already spooled it to a temporary file, and ZipFile reads it on demand
+    upload = zip_file.file
+    upload.seek(0, io.SEEK_END)
+    zip_size = upload.tell()
+    upload.seek(0)
+    
+    if zip_size > MAX_ZIP_SIZE_BYTES:
         raise BuilderError(
             "ZIP_TOO_LARGE",
             f"ZIP file exceeds maximum size of {MAX_ZIP_SIZE_BYTES // (1024 * 1024)} MB",
-            400
+            413
         )
     
+    # Decompression and level validation are CPU-bound; keep them off the event loop
+    return await asyncio.to_thread(_validate_levels_zip, upload)
+
+
+def _validate_levels_zip(upload: BinaryIO) -> List[tuple]:
+    """
+    Extract and validate the level files of a ZIP archive (blocking).
+    
+    Args:
+        upload: Seekable file object positioned at the start of the ZIP
+    
+    Returns:
+        List of tuples (filename, tilemap, width, height, content_hash)
+    
+    Raises:
+        BuilderError: If ZIP is invalid or levels fail validation
+    """
     levels = []
     errors = []
     
     try:
-        with zipfile.ZipFile(io.BytesIO(content), 'r') as zf:
+        with zipfile.ZipFile(upload, 'r') as zf:
             # Get all .txt files
-            txt_files = [f for f in zf.namelist() if f.endswith('.txt') and not f.startswith('__MACOSX')]
+            txt_infos = [
+                info for info in zf.infolist()
+                if info.filename.endswith('.txt') and not info.filename.startswith('__MACOSX')
+            ]
+            txt_files = [info.filename for info in txt_infos]
             
             if len(txt_files) < MIN_LEVELS_PER_GENERATOR:
                 raise BuilderError(
@@ -218,10 +246,29 @@ async def process_levels_zip(zip_file: UploadFile) -> List[tuple]:
                     400
                 )
             
-            for filename in txt_files:
+            # Reject oversized entries from the central directory before
+            # decompressing anything (zip bombs)
+            oversized = [info.filename for info in txt_infos if info.file_size > MAX_LEVEL_FILE_BYTES]
+            if oversized:
+                raise BuilderError(
+                    "LEVEL_FILE_TOO_LARGE",
+                    f"{oversized[0]}: level file exceeds {MAX_LEVEL_FILE_BYTES // 1024} KB uncompressed",
+                    413
+                )
+            
+            for info in txt_infos:
+                filename = info.filename
                 try:
-                    # Read file content
-                    raw_content = zf.read(filename).decode('utf-8')
+                    # Read file content (bounded, in case the header lies about the size)
+                    with zf.open(info) as entry:
+                        raw_bytes = entry.read(MAX_LEVEL_FILE_BYTES + 1)
+                    if len(raw_bytes) > MAX_LEVEL_FILE_BYTES:
+                        raise BuilderError(
+                            "LEVEL_FILE_TOO_LARGE",
+                            f"{filename}: level file exceeds {MAX_LEVEL_FILE_BYTES // 1024} KB uncompressed",
+                            413
+                        )
+                    raw_content = raw_bytes.decode('utf-8')
                     
                     # Get just the filename without path
                     base_filename = filename.split('/')[-1]
@@ -354,6 +401,7 @@ async def create_generator(
                  config.initial_volatility, now_utc)
             )
         
+        invalidate_matchmaking_cache()
         logger.info(f"Created generator: generator_id={metadata.generator_id} owner={user_id} levels={len(levels)}")
         
         return GeneratorInfo(
@@ -476,6 +524,7 @@ async def update_generator(
                     (level_id, generator_id, width, height, tilemap, content_hash, now_utc)
                 )
         
+        invalidate_matchmaking_cache()
         logger.info(f"Updated generator: generator_id={generator_id} owner={user_id} new_levels={len(levels)}")
         
         # Get current rating info and actual level count
@@ -595,6 +644,8 @@ def delete_generator(user_id: str, generator_id: str) -> None:
                     (generator_id,)
                 )
                 logger.info(f"Hard-deleted generator: generator_id={generator_id} owner={user_id}")
+        
+        invalidate_matchmaking_cache()
     
     except Exception as e:
         logger.error(f"Failed to delete generator: {e}")
@@ -33,6 +33,7 @@ class Config:
     migrations_path: str
     seed_path: str
     backup_path: str  # Backup directory path (Stage 1)
+    backup_retention: int  # Number of manual backups kept by /admin/backup
     
     # Debug mode (enables debug endpoints)
     debug: bool
@@ -43,11 +44,16 @@ class Config:
     # CORS settings (Stage 1)
     allowed_origins: list[str]
     
+    # Rate limiting storage ("memory://" per process, or e.g. "redis://host:6379/0"
+    # to share counters across workers; redis:// needs the redis package)
+    rate_limit_storage_uri: str
+    
     # Logging (Stage 1)
     log_level: str
     
     # Authentication (Stage 3)
     dev_auth: bool  # Enable dev login (testing only)
+    bcrypt_rounds: int  # bcrypt cost; 0 = calibrate at startup
     google_client_id: str  # Google OAuth client ID
     
     # Email (Stage 3)
@@ -95,11 +101,14 @@ def load_config() -> Config:
         migrations_path=os.environ.get("ARENA_MIGRATIONS_PATH", "/migrations"),
         seed_path=os.environ.get("ARENA_SEED_PATH", "/seed"),
         backup_path=os.environ.get("ARENA_BACKUP_PATH", "/backups"),
+        backup_retention=int(os.environ.get("ARENA_BACKUP_RETENTION", "20")),
         debug=os.environ.get("ARENA_DEBUG", "false").lower() in ("true", "1", "yes"),
         admin_key=os.environ.get("ARENA_ADMIN_KEY", ""),
         allowed_origins=allowed_origins,
+        rate_limit_storage_uri=os.environ.get("ARENA_RATE_LIMIT_STORAGE_URI", "memory://"),
         log_level=os.environ.get("ARENA_LOG_LEVEL", "INFO").upper(),
         dev_auth=os.environ.get("ARENA_DEV_AUTH", "false").lower() in ("true", "1", "yes"),
+        bcrypt_rounds=int(os.environ.get("ARENA_BCRYPT_ROUNDS", "0")),
         google_client_id=os.environ.get("ARENA_GOOGLE_CLIENT_ID", ""),
         sendgrid_api_key=os.environ.get("SENDGRID_API_KEY", ""),
         sendgrid_from_email=os.environ.get("SENDGRID_FROM_EMAIL", "noreply@pcg-arena.com"),
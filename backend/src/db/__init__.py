@@ -1,7 +1,7 @@
 """Database module for PCG Arena."""
 
 from .connection import get_connection, init_connection, transaction, close_connection
-from .migrations import run_migrations
+from .migrations import run_migrations, get_last_migration
 from .seed import import_generators, init_generator_ratings, import_levels, log_db_status
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "transaction",
     "close_connection",
     "run_migrations",
+    "get_last_migration",
     "import_generators",
     "init_generator_ratings",
     "import_levels",
@@ -20,6 +20,12 @@ logger = logging.getLogger(__name__)
 # Global connection holder (Stage 0: single connection is fine)
 _connection: Optional[sqlite3.Connection] = None
 
+# Prepared-statement cache size (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Page cache size in KiB (negative value = KiB rather than pages), ~20 MB
+PAGE_CACHE_KIB = 20000
+
 
 def init_connection(db_path: str) -> sqlite3.Connection:
     """
@@ -32,19 +38,24 @@ def init_connection(db_path: str) -> sqlite3.Connection:
         Configured SQLite connection.
         
     Note:
-        Creates parent directories if they don't exist.
+        Creates parent directories if they don't exist. db_path may also be
+        a "file:" URI, e.g. file:name?mode=memory&cache=shared.
         Enables foreign keys (required per-connection in SQLite).
     """
     global _connection
     
-    # Ensure parent directory exists
-    db_file = Path(db_path)
-    db_file.parent.mkdir(parents=True, exist_ok=True)
+    # "file:" URIs (e.g. the tests' shared in-memory database) are opened as
+    # URIs; plain paths get their parent directory created
+    is_uri = db_path.startswith("file:")
+    if not is_uri:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     
     logger.info(f"Connecting to database: {db_path}")
     
     # Create connection
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn = sqlite3.connect(
+        db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE, uri=is_uri
+    )
     
     # Enable foreign keys (MUST be done per-connection in SQLite)
     # Task E2: Foreign keys are enforced for every DB connection
@@ -59,6 +70,13 @@ def init_connection(db_path: str) -> sqlite3.Connection:
     # Enable WAL mode for better concurrency
     conn.execute("PRAGMA journal_mode = WAL")
     
+    # In WAL mode NORMAL only fsyncs at checkpoints, not on every commit; the
+    # database stays consistent, a power loss can only drop the latest commits
+    conn.execute("PRAGMA synchronous = NORMAL")
+    
+    # Larger page cache keeps hot tables/indexes in memory between requests
+    conn.execute(f"PRAGMA cache_size = -{PAGE_CACHE_KIB}")
+    
     # Return dict-like rows
     conn.row_factory = sqlite3.Row
     
@@ -96,6 +96,30 @@ def _apply_migration(migration_path: Path) -> None:
         raise RuntimeError(f"Migration {version} failed: {e}") from e
 
 
+def get_last_migration() -> dict:
+    """
+    Get the most recently applied migration.
+    
+    Migrations only run at startup, so callers can cache this result for the
+    lifetime of the process and refresh it after calling run_migrations().
+    
+    Returns:
+        Dict with "version" and "applied_at_utc" (both None if nothing applied).
+    """
+    if not _table_exists("schema_migrations"):
+        return {"version": None, "applied_at_utc": None}
+    
+    conn = get_connection()
+    cursor = conn.execute(
+        "SELECT version, applied_at_utc FROM schema_migrations ORDER BY version DESC LIMIT 1"
+    )
+    row = cursor.fetchone()
+    return {
+        "version": row["version"] if row else None,
+        "applied_at_utc": row["applied_at_utc"] if row else None,
+    }
+
+
 def run_migrations(migrations_path: str) -> int:
     """
     Run all pending migrations from the migrations directory.
@@ -6,12 +6,15 @@ Provides consistent error handling with standard error responses.
 """
 
 from typing import Optional, Dict, Any, Union
-from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 
 from models import ErrorResponse, ErrorCode
 
 
+_ERROR_RESPONSE_ADAPTER = TypeAdapter(ErrorResponse)
+
+
 class APIError(HTTPException):
     """
     Custom exception for API errors that will be handled by the global exception handler.
@@ -87,7 +90,36 @@ def raise_api_error(
     )
 
 
-async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
+def _error_response(status_code: int, error_response: ErrorResponse, request_id: Optional[str]) -> Response:
+    """
+    Serialize an ErrorResponse straight to JSON.
+    
+    The module-level TypeAdapter encodes to bytes in pydantic-core, skipping
+    the dict dump and stdlib json.dumps pass a JSONResponse(content=model_dump())
+    would do.
+    
+    Args:
+        status_code: HTTP status code
+        error_response: Error body
+        request_id: Correlation ID from the middleware, echoed as X-Request-Id
+    
+    Returns:
+        Response with ErrorResponse JSON body
+    """
+    response = Response(
+        content=_ERROR_RESPONSE_ADAPTER.dump_json(error_response),
+        status_code=status_code,
+        media_type="application/json"
+    )
+    
+    # Include request_id in response header if available
+    if request_id:
+        response.headers["X-Request-Id"] = request_id
+    
+    return response
+
+
+async def api_error_handler(request: Request, exc: APIError) -> Response:
     """
     Global exception handler for APIError exceptions.
     
@@ -98,7 +130,7 @@ async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
         exc: The APIError exception that was raised
     
     Returns:
-        JSONResponse with ErrorResponse format
+        Response with ErrorResponse JSON body
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -119,19 +151,10 @@ async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
         details=exc.details
     )
     
-    response = JSONResponse(
-        status_code=exc.status_code,
-        content=error_response.model_dump()
-    )
-    
-    # Include request_id in response header if available
-    if request_id:
-        response.headers["X-Request-Id"] = request_id
-    
-    return response
+    return _error_response(exc.status_code, error_response, request_id)
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> Response:
     """
     Handler for standard FastAPI HTTPException.
     
@@ -143,7 +166,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         exc: The HTTPException that was raised
     
     Returns:
-        JSONResponse with ErrorResponse format
+        Response with ErrorResponse JSON body
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -177,19 +200,10 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         retryable=retryable
     )
     
-    response = JSONResponse(
-        status_code=exc.status_code,
-        content=error_response.model_dump()
-    )
-    
-    # Include request_id in response header if available
-    if request_id:
-        response.headers["X-Request-Id"] = request_id
-    
-    return response
+    return _error_response(exc.status_code, error_response, request_id)
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> Response:
     """
     Handler for unexpected exceptions.
     
@@ -201,7 +215,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         exc: The exception that was raised
     
     Returns:
-        JSONResponse with ErrorResponse format
+        Response with ErrorResponse JSON body
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -221,14 +235,5 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         retryable=True
     )
     
-    response = JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response.model_dump()
-    )
-    
-    # Include request_id in response header if available
-    if request_id:
-        response.headers["X-Request-Id"] = request_id
-    
-    return response
+    return _error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, error_response, request_id)
 
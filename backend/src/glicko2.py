@@ -20,7 +20,7 @@ The algorithm:
 import math
 import logging
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -321,3 +321,44 @@ def match_quality(
     
     return outcome_uncertainty * rating_penalty
 
+
+def information_gain_many(rd1: float, rds: List[float]) -> List[float]:
+    """
+    information_gain(rd1, rd2) for every rd2 in rds.
+    
+    Normalizes rd1 once instead of per opponent.
+    """
+    inv_rd_range = 1.0 / (MAX_RD - MIN_RD)
+    norm_rd1 = (rd1 - MIN_RD) * inv_rd_range
+    return [math.sqrt(norm_rd1 * (rd2 - MIN_RD) * inv_rd_range) for rd2 in rds]
+
+
+def match_quality_many(
+    rating1: float, rd1: float,
+    ratings: List[float], rds: List[float]
+) -> List[float]:
+    """
+    match_quality(rating1, rd1, rating2, rd2) for every (rating2, rd2) pair.
+    
+    Player 1's Glicko-2 scale values are converted once and g() of each
+    opponent's RD is inlined, so the sweep is a single loop of float math.
+    """
+    mu1 = (rating1 - DEFAULT_RATING) / GLICKO2_SCALE
+    rd1_sq = rd1 * rd1
+    g_factor = 3.0 / (math.pi * math.pi * GLICKO2_SCALE * GLICKO2_SCALE)
+    
+    qualities = []
+    for rating2, rd2 in zip(ratings, rds):
+        rd2_sq = rd2 * rd2
+        rating_diff = rating1 - rating2
+        
+        # compute_expected_outcome with g(phi2) inlined
+        mu2 = (rating2 - DEFAULT_RATING) / GLICKO2_SCALE
+        g_val = 1.0 / math.sqrt(1.0 + g_factor * rd2_sq)
+        expected = 1.0 / (1.0 + math.exp(-g_val * (mu1 - mu2)))
+        outcome_uncertainty = 1.0 - abs(2.0 * expected - 1.0)
+        
+        rating_penalty = math.exp(-rating_diff * rating_diff / (2 * (rd1_sq + rd2_sq)))
+        qualities.append(outcome_uncertainty * rating_penalty)
+    
+    return qualities
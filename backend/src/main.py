@@ -9,30 +9,36 @@ This module initializes the application:
 4. Starts the API server
 """
 
+import asyncio
 import logging
+import os
 import sys
 import uuid
 import random
 import json
+import shutil
 import sqlite3
 import hashlib
+import hmac
 import math
 import time
+from dataclasses import asdict
 from datetime import datetime, timezone
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Optional
 
 import uvicorn
-from fastapi import FastAPI, Request, Response, Header, Depends, UploadFile, Form, File
-from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.exceptions import HTTPException
+from fastapi import FastAPI, Request, Response, Header, Depends, UploadFile, Form, File, BackgroundTasks
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
+from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from config import load_config
-from db import init_connection, get_connection, run_migrations, import_generators, init_generator_ratings, import_levels, log_db_status, transaction
+from db import init_connection, get_connection, run_migrations, get_last_migration, import_generators, init_generator_ratings, import_levels, log_db_status, transaction
 from errors import APIError, api_error_handler, http_exception_handler, general_exception_handler, raise_api_error, ErrorCode
 from middleware import RequestLoggingMiddleware
 from models import (
@@ -41,15 +47,19 @@ from models import (
     LeaderboardPreview, LeaderboardGeneratorPreview, Telemetry
 )
 from auth import (
-    User, DevLoginRequest, GoogleLoginRequest, EmailRegisterRequest, EmailLoginRequest,
+    User, AuthUserResponse, DevLoginRequest, GoogleLoginRequest, EmailRegisterRequest, EmailLoginRequest,
     ForgotPasswordRequest, ResetPasswordRequest,
-    get_current_user, create_user, get_user_by_email, get_user_by_google_sub,
-    create_session, delete_session, set_session_cookie, clear_session_cookie,
-    update_last_login, cleanup_expired_sessions, verify_google_token, SESSION_COOKIE_NAME,
-    hash_password, verify_password, validate_password, get_password_hash_by_email,
+    get_current_user, create_user, get_user_by_email, get_user_by_google_sub, upsert_google_user,
+    create_session, login_user, delete_session, set_session_cookie, clear_session_cookie,
+    cleanup_expired_sessions, hash_legacy_sessions, verify_google_token, SESSION_COOKIE_NAME,
+    invalidate_user_sessions_cache,
+    hash_password, verify_password, validate_password, is_valid_email, get_dummy_password_hash,
+    calibrate_password_hashing, password_needs_rehash,
+    get_user_with_password_hash_by_email, get_session_user_json,
     create_email_verification_token, verify_email_token, send_verification_email,
     create_password_reset_token, verify_password_reset_token, use_password_reset_token,
-    update_user_password, send_password_reset_email, mark_email_verified
+    claim_email_send, release_email_send,
+    update_user_password, send_password_reset_email
 )
 from builders import (
     GeneratorMetadata, GeneratorInfo as BuilderGeneratorInfo, BuilderError,
@@ -57,14 +67,15 @@ from builders import (
     MAX_GENERATORS_PER_USER, MIN_LEVELS_PER_GENERATOR, MAX_LEVELS_PER_GENERATOR
 )
 from matchmaking import (
-    select_generators_agis, select_random_level, update_pair_stats, get_matchmaking_stats
+    select_generators_agis, select_random_level, update_pair_stats, get_matchmaking_stats,
+    invalidate_matchmaking_cache, set_agis_params
 )
 from glicko2 import (
     update_ratings_glicko2, GlickoRating, DEFAULT_RD, DEFAULT_VOLATILITY
 )
 from stats import (
-    update_level_stats_for_vote, update_player_profile_for_vote,
-    update_player_session, store_trajectory, get_platform_stats,
+    utc_now_iso, update_level_stats_for_vote, update_player_profile_for_vote,
+    update_player_session, store_trajectory, get_platform_stats, invalidate_platform_stats_cache,
     get_level_stats, get_level_heatmap
 )
 from level_features import (
@@ -83,6 +94,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Filesystem paths derived from config (resolved once, not per request)
+_DB_PATH = Path(config.db_path)
+_BACKUP_DIR = Path(config.backup_path)
+
 # Allowed tags vocabulary (Stage 0)
 ALLOWED_TAGS = {
     "fun", "boring", "creative", "too_hard", "too_easy", 
@@ -105,8 +120,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _user_or_ip_rate_limit_key(request: Request) -> str:
+    """
+    Rate-limit key for authenticated endpoints: the user ID when logged in,
+    so users behind a shared IP don't throttle each other; else the client IP.
+    
+    The user is memoized on request.state, so the handler's own
+    require_auth() does not repeat the lookup.
+    """
+    user = get_current_user(request)
+    if user:
+        return f"user:{user.user_id}"
+    return get_remote_address(request)
+
+
 # S1-B5: Set up rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Counters live in config.rate_limit_storage_uri (per-process memory by
+# default; point it at Redis so limits hold across multiple workers)
+limiter = Limiter(key_func=get_remote_address, storage_uri=config.rate_limit_storage_uri)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -143,6 +174,9 @@ async def startup_event():
         applied = run_migrations(config.migrations_path)
         logger.info(f"Database ready (applied {applied} new migrations)")
         
+        # Migrations only run here, so the last applied one is cached for /debug/db-status
+        app.state.last_migration = get_last_migration()
+        
         # Import seed data: generators
         gen_count = import_generators(config.seed_path)
         logger.info(f"Generators ready ({gen_count} imported/updated)")
@@ -160,9 +194,21 @@ async def startup_event():
         if ratings_init > 0:
             logger.info(f"Initialized Glicko-2 ratings for {ratings_init} new generator(s)")
         
+        # Sessions from before tokens were hashed still store the raw token
+        hash_legacy_sessions()
+        
         # Log DB status summary
         log_db_status(config.db_path)
         
+        # Pick the bcrypt cost for this machine (keeps logins within budget)
+        calibrate_password_hashing()
+        
+        # Create backup directory once so /admin/backup doesn't mkdir per call
+        try:
+            _BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create backup directory {_BACKUP_DIR}: {e}")
+        
         # Task E1: Expired battles cleanup
         # Stage 0 uses expires_at_utc=NULL (no expiry), so this is skipped.
         # If needed in future: mark battles with expires_at_utc < now_utc and status=ISSUED as EXPIRED
@@ -192,15 +238,15 @@ async def health_check():
     votes_received = cursor.fetchone()["count"]
     
     # Get database size
-    import os
-    from pathlib import Path
-    db_path = Path(config.db_path)
-    db_size_bytes = db_path.stat().st_size if db_path.exists() else 0
+    try:
+        db_size_bytes = _DB_PATH.stat().st_size
+    except FileNotFoundError:
+        db_size_bytes = 0
     
     return JSONResponse({
         "protocol_version": "arena/v0",
         "status": "ok",
-        "server_time_utc": datetime.now(timezone.utc).isoformat(),
+        "server_time_utc": utc_now_iso(),
         "build": {
             "backend_version": "0.1.0"
         },
@@ -218,17 +264,139 @@ async def health_check():
     })
 
 
-@app.post("/v1/battles:next", response_model=BattleResponse)
-@app.post("/v1/battles%3Anext", response_model=BattleResponse)  # Handle URL-encoded version for PowerShell
+def _inline_schema_refs(node, defs: dict):
+    """Replace local "#/$defs/..." references with the referenced schemas."""
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return _inline_schema_refs(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+        return {key: _inline_schema_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_schema_refs(value, defs) for value in node]
+    return node
+
+
+def _json_body_openapi(model: type[BaseModel]) -> dict:
+    """
+    openapi_extra documenting a JSON request body read by _parse_json_body().
+    
+    Such routes take no body parameter, so FastAPI can't describe the body
+    itself; nested models are inlined since they aren't in components.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+    return {
+        "requestBody": {
+            "content": {"application/json": {"schema": _inline_schema_refs(schema, defs)}},
+            "required": True,
+        }
+    }
+
+
+async def _parse_json_body(request: Request, model: type[BaseModel]) -> BaseModel:
+    """
+    Validate the raw request body against a model in a single pass.
+    
+    FastAPI's body parameters json.loads() the body into dicts and lists and
+    then validate those; model_validate_json() parses and validates straight
+    from the bytes in pydantic-core, about twice as fast on vote bodies that
+    carry thousands of telemetry samples. Errors are re-raised as
+    RequestValidationError, so clients get the same 422 response as before.
+    """
+    body = await request.body()
+    if not body:
+        raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+
+def _battle_side(data: sqlite3.Row, controls: dict) -> BattleSide:
+    """
+    Build one side of a battle response from a joined levels/generators row.
+    
+    Uses model_construct(): every value comes straight from our own database
+    (levels are validated on import/upload), so re-running the field
+    validators on each battle would only repeat work.
+    """
+    return BattleSide.model_construct(
+        level_id=data["level_id"],
+        generator=GeneratorInfo.model_construct(
+            generator_id=data["generator_id"],
+            name=data["name"],
+            version=data["version"],
+            documentation_url=data["documentation_url"]
+        ),
+        format=LevelFormat.model_construct(
+            type=LevelFormatType.ASCII_TILEMAP.value,
+            width=data["width"],
+            height=data["height"],
+            newline="\n"
+        ),
+        level_payload=LevelPayload.model_construct(
+            encoding=Encoding.UTF8.value,
+            tilemap=data["tilemap_text"]
+        ),
+        content_hash=data["content_hash"],
+        metadata=LevelMetadata.model_construct(
+            seed=data["seed"],
+            controls=controls
+        )
+    )
+
+
+# Built once at import; dump_json() returns bytes from pydantic-core, which
+# Response passes through without re-encoding a str
+_BATTLE_RESPONSE_ADAPTER = TypeAdapter(BattleResponse)
+_VOTE_RESPONSE_ADAPTER = TypeAdapter(VoteResponse)
+
+
+def _battle_response(battle_id: str, now_utc: str, left: BattleSide, right: BattleSide) -> Response:
+    """
+    Serialize a BattleResponse directly to JSON.
+    
+    Returning a Response skips FastAPI's response_model pass (dump to dict,
+    validate again, encode); response_model stays on the routes for the schema.
+    
+    Presentation config (Stage 0): hardcoded values for stable client UX
+    - play_order: LEFT_THEN_RIGHT (client presents left level first, then right)
+    - reveal_generator_names_after_vote: true (generator identities revealed after voting)
+    - suggested_time_limit_seconds: 300 (5 minutes total for both levels)
+    """
+    battle_response = BattleResponse.model_construct(
+        protocol_version="arena/v0",
+        battle=Battle.model_construct(
+            battle_id=battle_id,
+            issued_at_utc=now_utc,
+            expires_at_utc=None,
+            presentation=BattlePresentation.model_construct(
+                play_order=PlayOrder.LEFT_THEN_RIGHT.value,
+                reveal_generator_names_after_vote=True,
+                suggested_time_limit_seconds=300
+            ),
+            left=left,
+            right=right
+        )
+    )
+    return Response(content=_BATTLE_RESPONSE_ADAPTER.dump_json(battle_response), media_type="application/json")
+
+
+@app.post("/v1/battles:next", response_model=BattleResponse, openapi_extra=_json_body_openapi(BattleRequest))
+@app.post("/v1/battles%3Anext", response_model=BattleResponse, openapi_extra=_json_body_openapi(BattleRequest))  # Handle URL-encoded version for PowerShell
 @limiter.limit("10/minute")  # S1-B5: Rate limiting
-async def fetch_next_battle(battle_request: BattleRequest, request: Request):
+async def fetch_next_battle(request: Request):
     """
     Fetch the next battle: two levels from different generators.
     
     Creates a persisted battle row and returns both levels with metadata.
+    The BattleRequest body is parsed by _parse_json_body() rather than FastAPI.
     
     Note: Registered with both `:` and `%3A` to handle PowerShell Invoke-RestMethod URL encoding.
     """
+    battle_request = await _parse_json_body(request, BattleRequest)
+    
     request_counts["total"] += 1
     request_counts["battles"] += 1
     
@@ -306,7 +474,7 @@ async def fetch_next_battle(battle_request: BattleRequest, request: Request):
     battle_id = f"btl_{uuid.uuid4()}"
     
     # 6. Insert into battles table (within a transaction)
-    now_utc = datetime.now(timezone.utc).isoformat()
+    now_utc = utc_now_iso()
     
     try:
         with transaction() as cursor:
@@ -386,70 +554,11 @@ async def fetch_next_battle(battle_request: BattleRequest, request: Request):
     right_controls = json.loads(right_data["controls_json"]) if right_data["controls_json"] else {}
     
     # Build response
-    # Presentation config (Stage 0): hardcoded values for stable client UX
-    # - play_order: LEFT_THEN_RIGHT (client presents left level first, then right)
-    # - reveal_generator_names_after_vote: true (generator identities revealed after voting)
-    # - suggested_time_limit_seconds: 300 (5 minutes total for both levels)
-    battle_response = BattleResponse(
-        protocol_version="arena/v0",
-        battle=Battle(
-            battle_id=battle_id,
-            issued_at_utc=now_utc,
-            expires_at_utc=None,
-            presentation=BattlePresentation(
-                play_order=PlayOrder.LEFT_THEN_RIGHT,
-                reveal_generator_names_after_vote=True,
-                suggested_time_limit_seconds=300
-            ),
-            left=BattleSide(
-                level_id=left_data["level_id"],
-                generator=GeneratorInfo(
-                    generator_id=left_data["generator_id"],
-                    name=left_data["name"],
-                    version=left_data["version"],
-                    documentation_url=left_data["documentation_url"]
-                ),
-                format=LevelFormat(
-                    type=LevelFormatType.ASCII_TILEMAP,
-                    width=left_data["width"],
-                    height=left_data["height"],
-                    newline="\n"
-                ),
-                level_payload=LevelPayload(
-                    encoding=Encoding.UTF8,
-                    tilemap=left_data["tilemap_text"]
-                ),
-                content_hash=left_data["content_hash"],
-                metadata=LevelMetadata(
-                    seed=left_data["seed"],
-                    controls=left_controls
-                )
-            ),
-            right=BattleSide(
-                level_id=right_data["level_id"],
-                generator=GeneratorInfo(
-                    generator_id=right_data["generator_id"],
-                    name=right_data["name"],
-                    version=right_data["version"],
-                    documentation_url=right_data["documentation_url"]
-                ),
-                format=LevelFormat(
-                    type=LevelFormatType.ASCII_TILEMAP,
-                    width=right_data["width"],
-                    height=right_data["height"],
-                    newline="\n"
-                ),
-                level_payload=LevelPayload(
-                    encoding=Encoding.UTF8,
-                    tilemap=right_data["tilemap_text"]
-                ),
-                content_hash=right_data["content_hash"],
-                metadata=LevelMetadata(
-                    seed=right_data["seed"],
-                    controls=right_controls
-                )
-            )
-        )
+    battle_response = _battle_response(
+        battle_id,
+        now_utc,
+        _battle_side(left_data, left_controls),
+        _battle_side(right_data, right_controls)
     )
     
     logger.info(
@@ -516,7 +625,7 @@ async def create_practice_battle(request_data: PracticeBattleRequest, request: R
     
     # Create practice battle
     battle_id = f"btl_practice_{uuid.uuid4()}"
-    now_utc = datetime.now(timezone.utc).isoformat()
+    now_utc = utc_now_iso()
     generator_id = level_data["generator_id"]
     
     try:
@@ -559,46 +668,9 @@ async def create_practice_battle(request_data: PracticeBattleRequest, request: R
     controls = json.loads(level_data["controls_json"]) if level_data["controls_json"] else {}
     
     # Build response (same level data for both sides)
-    battle_side = BattleSide(
-        level_id=level_data["level_id"],
-        generator=GeneratorInfo(
-            generator_id=level_data["generator_id"],
-            name=level_data["name"],
-            version=level_data["version"],
-            documentation_url=level_data["documentation_url"]
-        ),
-        format=LevelFormat(
-            type=LevelFormatType.ASCII_TILEMAP,
-            width=level_data["width"],
-            height=level_data["height"],
-            newline="\n"
-        ),
-        level_payload=LevelPayload(
-            encoding=Encoding.UTF8,
-            tilemap=level_data["tilemap_text"]
-        ),
-        content_hash=level_data["content_hash"],
-        metadata=LevelMetadata(
-            seed=level_data["seed"],
-            controls=controls
-        )
-    )
+    battle_side = _battle_side(level_data, controls)
     
-    battle_response = BattleResponse(
-        protocol_version="arena/v0",
-        battle=Battle(
-            battle_id=battle_id,
-            issued_at_utc=now_utc,
-            expires_at_utc=None,
-            presentation=BattlePresentation(
-                play_order=PlayOrder.LEFT_THEN_RIGHT,
-                reveal_generator_names_after_vote=True,  # Always reveal for practice
-                suggested_time_limit_seconds=300
-            ),
-            left=battle_side,
-            right=battle_side  # Same level on both sides
-        )
-    )
+    battle_response = _battle_response(battle_id, now_utc, battle_side, battle_side)
     
     logger.info(f"Practice battle issued: battle_id={battle_id} level={request_data.level_id}")
     
@@ -625,7 +697,7 @@ async def complete_practice_battle(request_data: PracticeCompleteRequest, reques
     - Only store trajectory and death data for analytics
     """
     conn = get_connection()
-    now_utc = datetime.now(timezone.utc).isoformat()
+    now_utc = utc_now_iso()
     
     # Validate battle exists and is a practice battle
     cursor = conn.execute(
@@ -929,6 +1001,9 @@ def update_ratings(
         f"right={right_rating:.1f}±{right_rd:.0f} -> {new_right.rating:.1f}±{new_right.rd:.0f}"
     )
     
+    # New ratings/RD change AGIS weights for the next battle
+    invalidate_matchmaking_cache()
+    
     return (delta_left, delta_right, rd_info)
 
 
@@ -1003,23 +1078,70 @@ def insert_rating_event(
     )
 
 
-@app.post("/v1/votes", response_model=VoteResponse)
+def _vote_response(cursor: sqlite3.Cursor, vote_id: str, now_utc: str) -> Response:
+    """
+    Build the vote response with the current leaderboard preview.
+    
+    Rows come from our own ratings table, so the models are built with
+    model_construct() and serialized directly (see _battle_response).
+    """
+    cursor.execute(
+        """
+        SELECT 
+            g.generator_id, g.name,
+            r.rating_value, r.games_played
+        FROM generators g
+        JOIN ratings r ON g.generator_id = r.generator_id
+        WHERE g.is_active = 1
+        ORDER BY r.rating_value DESC, g.generator_id ASC
+        """
+    )
+    leaderboard_generators = [
+        LeaderboardGeneratorPreview.model_construct(
+            generator_id=row["generator_id"],
+            name=row["name"],
+            rating=row["rating_value"],
+            games_played=row["games_played"]
+        )
+        for row in cursor.fetchall()
+    ]
+    
+    cursor.execute("SELECT MAX(updated_at_utc) as last_update FROM ratings")
+    last_update_row = cursor.fetchone()
+    last_update = last_update_row["last_update"] if last_update_row["last_update"] else now_utc
+    
+    vote_response = VoteResponse.model_construct(
+        protocol_version="arena/v0",
+        accepted=True,
+        vote_id=vote_id,
+        leaderboard_preview=LeaderboardPreview.model_construct(
+            updated_at_utc=last_update,
+            generators=leaderboard_generators
+        )
+    )
+    return Response(content=_VOTE_RESPONSE_ADAPTER.dump_json(vote_response), media_type="application/json")
+
+
+@app.post("/v1/votes", response_model=VoteResponse, openapi_extra=_json_body_openapi(VoteRequest))
 @limiter.limit("20/minute")  # S1-B5: Rate limiting (higher limit for votes)
-async def submit_vote(vote_request: VoteRequest, request: Request):
+async def submit_vote(request: Request):
     """
     Submit a vote for a battle.
     
     Accepts vote outcome, ensures idempotency, and atomically updates database and ratings.
+    The VoteRequest body is parsed by _parse_json_body() rather than FastAPI.
     """
+    vote_request = await _parse_json_body(request, VoteRequest)
+    
     request_counts["total"] += 1
     request_counts["votes"] += 1
     
     conn = get_connection()
-    now_utc = datetime.now(timezone.utc).isoformat()
+    now_utc = utc_now_iso()
     
     # Request validation
     # session_id and battle_id are required by Pydantic model
-    # result is validated by VoteResult enum
+    # result is validated by the VoteResultValue literal
     
     # Validate tags vocabulary for left level
     if vote_request.left_tags:
@@ -1054,7 +1176,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
     payload_hash = compute_payload_hash(
         vote_request.battle_id,
         vote_request.session_id,
-        vote_request.result.value,
+        vote_request.result,
         left_tags_list,
         right_tags_list,
         telemetry_dict
@@ -1100,43 +1222,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
                             vote_id = existing_vote["vote_id"]
                             logger.info(f"Idempotent vote replay: battle_id={vote_request.battle_id} vote_id={vote_id}")
                             
-                            # Fetch leaderboard for response
-                            cursor.execute(
-                                """
-                                SELECT 
-                                    g.generator_id, g.name,
-                                    r.rating_value, r.games_played
-                                FROM generators g
-                                JOIN ratings r ON g.generator_id = r.generator_id
-                                WHERE g.is_active = 1
-                                ORDER BY r.rating_value DESC, g.generator_id ASC
-                                """
-                            )
-                            generators_data = cursor.fetchall()
-                            
-                            leaderboard_generators = [
-                                LeaderboardGeneratorPreview(
-                                    generator_id=row["generator_id"],
-                                    name=row["name"],
-                                    rating=row["rating_value"],
-                                    games_played=row["games_played"]
-                                )
-                                for row in generators_data
-                            ]
-                            
-                            cursor.execute("SELECT MAX(updated_at_utc) as last_update FROM ratings")
-                            last_update_row = cursor.fetchone()
-                            last_update = last_update_row["last_update"] if last_update_row["last_update"] else now_utc
-                            
-                            return VoteResponse(
-                                protocol_version="arena/v0",
-                                accepted=True,
-                                vote_id=vote_id,
-                                leaderboard_preview=LeaderboardPreview(
-                                    updated_at_utc=last_update,
-                                    generators=leaderboard_generators
-                                )
-                            )
+                            return _vote_response(cursor, vote_id, now_utc)
                         else:
                             # Different payload for same battle
                             raise_api_error(
@@ -1214,7 +1300,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
                         vote_request.session_id,
                         vote_request.player_id,  # Stage 5: Include player_id
                         now_utc,
-                        vote_request.result.value,
+                        vote_request.result,
                         left_tags_json,
                         right_tags_json,
                         telemetry_json,
@@ -1237,7 +1323,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
                     cursor,
                     left_generator_id,
                     right_generator_id,
-                    vote_request.result.value,
+                    vote_request.result,
                     now_utc,
                     config.initial_rating,
                     config.initial_rd,
@@ -1251,7 +1337,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
                     vote_request.battle_id,
                     left_generator_id,
                     right_generator_id,
-                    vote_request.result.value,
+                    vote_request.result,
                     delta_left,
                     delta_right,
                     now_utc,
@@ -1263,7 +1349,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
                     cursor,
                     left_generator_id,
                     right_generator_id,
-                    vote_request.result.value,
+                    vote_request.result,
                     now_utc
                 )
                 
@@ -1287,7 +1373,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
                         right_level_id,
                         left_generator_id,
                         right_generator_id,
-                        vote_request.result.value,
+                        vote_request.result,
                         left_telemetry_data,
                         right_telemetry_data,
                         left_tags_list,
@@ -1324,54 +1410,23 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
                             "right", right_telemetry_data, now_utc
                         )
             
-            # Fetch leaderboard for response
-            cursor.execute(
-                """
-                SELECT 
-                    g.generator_id, g.name,
-                    r.rating_value, r.games_played
-                FROM generators g
-                JOIN ratings r ON g.generator_id = r.generator_id
-                WHERE g.is_active = 1
-                ORDER BY r.rating_value DESC, g.generator_id ASC
-                """
-            )
-            generators_data = cursor.fetchall()
-            
-            leaderboard_generators = [
-                LeaderboardGeneratorPreview(
-                    generator_id=row["generator_id"],
-                    name=row["name"],
-                    rating=row["rating_value"],
-                    games_played=row["games_played"]
-                )
-                for row in generators_data
-            ]
-            
-            cursor.execute("SELECT MAX(updated_at_utc) as last_update FROM ratings")
-            last_update_row = cursor.fetchone()
-            last_update = last_update_row["last_update"] if last_update_row["last_update"] else now_utc
-            
             logger.info(
                 f"Vote accepted: vote_id={vote_id} battle_id={vote_request.battle_id} "
-                f"result={vote_request.result.value} left_tags={left_tags_list} right_tags={right_tags_list}"
+                f"result={vote_request.result} left_tags={left_tags_list} right_tags={right_tags_list}"
             )
             
-            return VoteResponse(
-                protocol_version="arena/v0",
-                accepted=True,
-                vote_id=vote_id,
-                leaderboard_preview=LeaderboardPreview(
-                    updated_at_utc=last_update,
-                    generators=leaderboard_generators
-                )
-            )
+            invalidate_platform_stats_cache()
+            
+            # Leaderboard for the response, read inside the same transaction
+            return _vote_response(cursor, vote_id, now_utc)
             
     except APIError:
         # Re-raise API errors
         raise
     except sqlite3.IntegrityError as e:
         logger.error(f"Database integrity error during vote submission: {e}")
+        # The transaction rolled back; drop any matchmaking state patched inside it
+        invalidate_matchmaking_cache()
         raise_api_error(
             ErrorCode.INTERNAL_ERROR,
             "Failed to submit vote due to database constraint violation",
@@ -1380,6 +1435,7 @@ async def submit_vote(vote_request: VoteRequest, request: Request):
         )
     except Exception as e:
         logger.exception(f"Unexpected error during vote submission: {e}")
+        invalidate_matchmaking_cache()
         raise_api_error(
             ErrorCode.INTERNAL_ERROR,
             "An internal error occurred while processing vote",
@@ -1975,8 +2031,6 @@ async def test_error(error_code: str):
     This endpoint allows testing different error codes and responses.
     Not part of the production API - for development/testing only.
     """
-    from errors import raise_api_error, ErrorCode
-    
     # Map error codes to test scenarios
     error_tests = {
         "NO_BATTLE_AVAILABLE": {
@@ -2056,8 +2110,6 @@ async def get_leaderboard():
     
     Returns generators sorted by rating (descending), with stats.
     """
-    from datetime import datetime, timezone
-    
     conn = get_connection()
     
     # Join generators and ratings, sort by rating DESC, then generator_id
@@ -2107,7 +2159,7 @@ async def get_leaderboard():
         )
         last_update = cursor.fetchone()["last_update"]
     else:
-        last_update = datetime.now(timezone.utc).isoformat()
+        last_update = utc_now_iso()
     
     return JSONResponse({
         "protocol_version": "arena/v0",
@@ -2515,6 +2567,9 @@ async def admin_delete_builder(request: Request, user_id: str):
             logger.info(f"Admin {admin.email} banned user {user_row['email']}: "
                        f"deleted {deleted_gens} generators, soft-deleted {soft_deleted_gens} generators")
         
+        invalidate_user_sessions_cache(user_id)
+        invalidate_matchmaking_cache()
+        
         return JSONResponse({
             "protocol_version": "arena/v0",
             "message": f"User '{user_row['email']}' has been banned",
@@ -2677,6 +2732,8 @@ async def admin_delete_generator(request: Request, generator_id: str):
                 logger.info(f"Admin {admin.email} hard-deleted generator {generator_id}")
                 delete_type = "hard"
         
+        invalidate_matchmaking_cache()
+        
         return JSONResponse({
             "protocol_version": "arena/v0",
             "message": f"Generator '{gen_row['name']}' has been deleted",
@@ -2729,8 +2786,6 @@ async def get_generator_details(generator_id: str):
     - Generator detail page (accessible from leaderboard)
     - Builder profile (viewing own generators)
     """
-    from datetime import datetime, timezone
-    
     conn = get_connection()
     
     # Get generator info with rating
@@ -2771,7 +2826,6 @@ async def get_generator_details(generator_id: str):
         )
     
     # Parse tags
-    import json
     tags = json.loads(row["tags_json"]) if row["tags_json"] else []
     
     # Get all levels for this generator
@@ -2851,8 +2905,6 @@ async def leaderboard_page():
     
     Provides a human-readable view of generator rankings.
     """
-    from datetime import datetime, timezone
-    
     conn = get_connection()
     
     # Get leaderboard data
@@ -3008,6 +3060,154 @@ async def leaderboard_page():
 # These endpoints help inspect database state without opening SQLite directly.
 # For Stage 0 local-only, no auth needed. For hosted stages, guard behind ARENA_DEBUG.
 
+# Debug SQL is kept in module constants so every call reuses the same statement
+# text and hits the connection's prepared-statement cache.
+_DEBUG_TABLES = (
+    "generators", "levels", "battles", "votes",
+    "ratings", "rating_events", "schema_migrations"
+)
+# Safe: table names come from the whitelist above, not user input
+_SQL_TABLE_COUNTS = {
+    table_name: f"SELECT COUNT(*) as count FROM {table_name}"
+    for table_name in _DEBUG_TABLES
+}
+
+# Debug listings name their columns so rows can be unpacked positionally
+_BATTLE_COLUMNS = """
+    battle_id, session_id, status, issued_at_utc, expires_at_utc,
+    left_level_id, right_level_id, left_generator_id, right_generator_id,
+    matchmaking_policy, created_at_utc, updated_at_utc
+"""
+
+_SQL_BATTLES_BY_STATUS = f"""
+    SELECT {_BATTLE_COLUMNS} FROM battles 
+    WHERE status = ?
+    ORDER BY created_at_utc DESC
+    LIMIT ?
+"""
+
+_SQL_BATTLE_BY_ID = f"""
+    SELECT {_BATTLE_COLUMNS} FROM battles 
+    WHERE battle_id = ?
+"""
+
+_SQL_BATTLES_ALL = f"""
+    SELECT {_BATTLE_COLUMNS} FROM battles 
+    ORDER BY created_at_utc DESC
+    LIMIT ?
+"""
+
+_SQL_VOTES = """
+    SELECT 
+        vote_id, battle_id, session_id, result,
+        left_tags_json, right_tags_json, telemetry_json,
+        payload_hash, created_at_utc
+    FROM votes 
+    ORDER BY created_at_utc DESC
+    LIMIT ?
+"""
+
+_SQL_PAIR_STATS = """
+    SELECT 
+        gen1_id, gen2_id, battle_count, 
+        gen1_wins, gen2_wins, ties, skips,
+        last_battle_utc
+    FROM generator_pair_stats
+    ORDER BY battle_count DESC
+    LIMIT ?
+"""
+
+# Generator IDs are bound as one JSON array so the statement text doesn't
+# depend on how many are requested
+_SQL_RATINGS_BY_ID = """
+    SELECT generator_id, rating_value, games_played
+    FROM ratings
+    WHERE generator_id IN (SELECT value FROM json_each(?))
+"""
+
+_SQL_RATINGS_ALL = """
+    SELECT generator_id, rating_value, games_played
+    FROM ratings
+"""
+
+
+def _stream_json_rows(list_key: str, rows: list, row_to_dict, trailer: dict):
+    """
+    Stream a debug listing as JSON without building the full payload string.
+    
+    Yields the response envelope piece by piece: the opening fragment, one
+    serialized object per row, and a trailer with the row count plus any
+    extra fields. The rows are fetched by the handler (at most `limit`), since
+    the generator runs in a threadpool after the handler returns and must not
+    touch the shared connection.
+    
+    Args:
+        list_key: Name of the JSON array holding the rows (e.g. "battles")
+        rows: Rows already fetched from the database
+        row_to_dict: Converts a database row into a JSON-serializable dict
+        trailer: Extra top-level fields emitted after the array
+    """
+    yield f'{{"protocol_version":"arena/v0","{list_key}":['.encode("utf-8")
+    
+    for count, row in enumerate(rows):
+        chunk = json.dumps(row_to_dict(row), separators=(",", ":"))
+        yield (("," if count else "") + chunk).encode("utf-8")
+    
+    # Drop the leading "{" of the serialized trailer to continue the envelope
+    tail = json.dumps({"count": len(rows), **trailer}, separators=(",", ":"))
+    yield ("]," + tail[1:]).encode("utf-8")
+
+
+def _execute_tuples(conn: sqlite3.Connection, sql: str, params: tuple) -> sqlite3.Cursor:
+    """
+    Execute a query on a cursor that yields plain tuples instead of sqlite3.Row.
+    
+    The row factory is overridden on this cursor only, so the shared
+    connection keeps returning sqlite3.Row everywhere else.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params)
+
+
+def _debug_battle_row(row: tuple) -> dict:
+    """Convert a battles row (_BATTLE_COLUMNS order) into the /debug/battles representation."""
+    (battle_id, session_id, status, issued_at_utc, expires_at_utc,
+     left_level_id, right_level_id, left_generator_id, right_generator_id,
+     matchmaking_policy, created_at_utc, updated_at_utc) = row
+    return {
+        "battle_id": battle_id,
+        "session_id": session_id,
+        "status": status,
+        "issued_at_utc": issued_at_utc,
+        "expires_at_utc": expires_at_utc,
+        "left_level_id": left_level_id,
+        "right_level_id": right_level_id,
+        "left_generator_id": left_generator_id,
+        "right_generator_id": right_generator_id,
+        "matchmaking_policy": matchmaking_policy,
+        "created_at_utc": created_at_utc,
+        "updated_at_utc": updated_at_utc,
+    }
+
+
+def _debug_vote_row(row: tuple) -> dict:
+    """Convert a votes row (_SQL_VOTES order) into the /debug/votes representation."""
+    (vote_id, battle_id, session_id, result, left_tags_json, right_tags_json,
+     telemetry_json, payload_hash, created_at_utc) = row
+    return {
+        "vote_id": vote_id,
+        "battle_id": battle_id,
+        "session_id": session_id,
+        "result": result,
+        "left_tags": json.loads(left_tags_json) if left_tags_json else [],
+        "right_tags": json.loads(right_tags_json) if right_tags_json else [],
+        "telemetry": json.loads(telemetry_json) if telemetry_json else {},
+        "payload_hash": payload_hash,
+        "created_at_utc": created_at_utc,
+    }
+
+
 @app.get("/debug/db-status")
 async def debug_db_status():
     """
@@ -3024,36 +3224,23 @@ async def debug_db_status():
             status_code=403
         )
     
-    import os
-    from pathlib import Path
-    
     conn = get_connection()
     
     # Get table counts (using whitelist for safety)
-    table_names = [
-        "generators", "levels", "battles", "votes", 
-        "ratings", "rating_events", "schema_migrations"
-    ]
     tables = {}
     
-    for table_name in table_names:
-        # Safe: table_name is from whitelist, not user input
-        cursor = conn.execute(f"SELECT COUNT(*) as count FROM {table_name}")
+    for table_name, count_sql in _SQL_TABLE_COUNTS.items():
+        cursor = conn.execute(count_sql)
         tables[table_name] = cursor.fetchone()["count"]
     
-    # Get last migration
-    cursor = conn.execute(
-        "SELECT version, applied_at_utc FROM schema_migrations ORDER BY version DESC LIMIT 1"
-    )
-    last_migration_row = cursor.fetchone()
-    last_migration = {
-        "version": last_migration_row["version"] if last_migration_row else None,
-        "applied_at_utc": last_migration_row["applied_at_utc"] if last_migration_row else None,
-    }
+    # Last migration is cached at startup (migrations never run at request time)
+    last_migration = app.state.last_migration
     
     # Get database file size
-    db_path = Path(config.db_path)
-    db_size_bytes = db_path.stat().st_size if db_path.exists() else 0
+    try:
+        db_size_bytes = _DB_PATH.stat().st_size
+    except FileNotFoundError:
+        db_size_bytes = 0
     db_size_mb = db_size_bytes / (1024 * 1024)
     
     # Get foreign keys status
@@ -3106,48 +3293,45 @@ async def debug_battles(status: str = None, limit: int = 10):
                 retryable=False,
                 status_code=400
             )
-        cursor = conn.execute(
-            """
-            SELECT * FROM battles 
-            WHERE status = ?
-            ORDER BY created_at_utc DESC
-            LIMIT ?
-            """,
-            (status, limit)
-        )
+        rows = _execute_tuples(conn, _SQL_BATTLES_BY_STATUS, (status, limit)).fetchall()
     else:
-        cursor = conn.execute(
-            """
-            SELECT * FROM battles 
-            ORDER BY created_at_utc DESC
-            LIMIT ?
-            """,
-            (limit,)
+        rows = _execute_tuples(conn, _SQL_BATTLES_ALL, (limit,)).fetchall()
+    
+    return StreamingResponse(
+        _stream_json_rows("battles", rows, _debug_battle_row, {"status_filter": status, "limit": limit}),
+        media_type="application/json",
+    )
+
+
+@app.get("/debug/battles/{battle_id}")
+async def debug_battle(battle_id: str):
+    """
+    Get a single battle record by ID (primary-key lookup).
+    
+    Only available when ARENA_DEBUG=true.
+    """
+    if not config.debug:
+        raise_api_error(
+            ErrorCode.INTERNAL_ERROR,
+            "Debug endpoints are disabled. Set ARENA_DEBUG=true to enable.",
+            retryable=False,
+            status_code=403
         )
     
-    battles = []
-    for row in cursor.fetchall():
-        battles.append({
-            "battle_id": row["battle_id"],
-            "session_id": row["session_id"],
-            "status": row["status"],
-            "issued_at_utc": row["issued_at_utc"],
-            "expires_at_utc": row["expires_at_utc"],
-            "left_level_id": row["left_level_id"],
-            "right_level_id": row["right_level_id"],
-            "left_generator_id": row["left_generator_id"],
-            "right_generator_id": row["right_generator_id"],
-            "matchmaking_policy": row["matchmaking_policy"],
-            "created_at_utc": row["created_at_utc"],
-            "updated_at_utc": row["updated_at_utc"],
-        })
+    conn = get_connection()
+    row = _execute_tuples(conn, _SQL_BATTLE_BY_ID, (battle_id,)).fetchone()
+    
+    if row is None:
+        raise_api_error(
+            ErrorCode.BATTLE_NOT_FOUND,
+            f"Battle '{battle_id}' not found",
+            retryable=False,
+            status_code=404
+        )
     
     return JSONResponse({
         "protocol_version": "arena/v0",
-        "battles": battles,
-        "count": len(battles),
-        "status_filter": status,
-        "limit": limit,
+        "battle": _debug_battle_row(row),
     })
 
 
@@ -3174,35 +3358,12 @@ async def debug_votes(limit: int = 10):
     
     conn = get_connection()
     
-    cursor = conn.execute(
-        """
-        SELECT * FROM votes 
-        ORDER BY created_at_utc DESC
-        LIMIT ?
-        """,
-        (limit,)
-    )
-    
-    votes = []
-    for row in cursor.fetchall():
-        votes.append({
-            "vote_id": row["vote_id"],
-            "battle_id": row["battle_id"],
-            "session_id": row["session_id"],
-            "result": row["result"],
-            "left_tags": json.loads(row["left_tags_json"]) if row["left_tags_json"] else [],
-            "right_tags": json.loads(row["right_tags_json"]) if row["right_tags_json"] else [],
-            "telemetry": json.loads(row["telemetry_json"]) if row["telemetry_json"] else {},
-            "payload_hash": row["payload_hash"],
-            "created_at_utc": row["created_at_utc"],
-        })
+    rows = _execute_tuples(conn, _SQL_VOTES, (limit,)).fetchall()
     
-    return JSONResponse({
-        "protocol_version": "arena/v0",
-        "votes": votes,
-        "count": len(votes),
-        "limit": limit,
-    })
+    return StreamingResponse(
+        _stream_json_rows("votes", rows, _debug_vote_row, {"limit": limit}),
+        media_type="application/json",
+    )
 
 
 @app.get("/debug/matchmaking")
@@ -3236,10 +3397,49 @@ async def debug_matchmaking():
     })
 
 
-@app.get("/debug/pair-stats")
-async def debug_pair_stats(limit: int = 50):
+@app.get("/debug/ratings")
+async def debug_ratings(ids: Optional[str] = None):
     """
-    Get generator pair battle statistics for confusion matrix.
+    Get current ratings for a few generators without the full leaderboard.
+    
+    Query parameters:
+    - ids: Comma-separated generator IDs. If not provided, returns all.
+      Unknown IDs are left out of the result.
+    
+    Only available when ARENA_DEBUG=true.
+    """
+    if not config.debug:
+        raise_api_error(
+            ErrorCode.INTERNAL_ERROR,
+            "Debug endpoints are disabled. Set ARENA_DEBUG=true to enable.",
+            retryable=False,
+            status_code=403
+        )
+    
+    conn = get_connection()
+    
+    if ids:
+        cursor = _execute_tuples(conn, _SQL_RATINGS_BY_ID, (json.dumps(ids.split(",")),))
+    else:
+        cursor = _execute_tuples(conn, _SQL_RATINGS_ALL, ())
+    
+    ratings = {}
+    games_played = {}
+    for generator_id, rating_value, played in cursor:
+        ratings[generator_id] = rating_value
+        games_played[generator_id] = played
+    
+    return JSONResponse({
+        "protocol_version": "arena/v0",
+        "ratings": ratings,
+        "games_played": games_played,
+    })
+
+
+@app.get("/debug/pair-stats")
+async def debug_pair_stats(limit: int = 50):
+    """
+    Get generator pair battle statistics for confusion matrix.
     
     Returns battle counts and win rates between generator pairs.
     
@@ -3254,18 +3454,7 @@ async def debug_pair_stats(limit: int = 50):
         )
     
     conn = get_connection()
-    cursor = conn.execute(
-        """
-        SELECT 
-            gen1_id, gen2_id, battle_count, 
-            gen1_wins, gen2_wins, ties, skips,
-            last_battle_utc
-        FROM generator_pair_stats
-        ORDER BY battle_count DESC
-        LIMIT ?
-        """,
-        (min(limit, 500),)
-    )
+    cursor = conn.execute(_SQL_PAIR_STATS, (min(limit, 500),))
     
     pairs = []
     for row in cursor.fetchall():
@@ -3329,7 +3518,7 @@ def verify_admin_key(authorization: str = Header(None)) -> bool:
         )
     
     provided_key = parts[1]
-    if provided_key != config.admin_key:
+    if not hmac.compare_digest(provided_key.encode("utf-8"), config.admin_key.encode("utf-8")):
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
             "Invalid admin key",
@@ -3340,6 +3529,49 @@ def verify_admin_key(authorization: str = Header(None)) -> bool:
     return True
 
 
+def _set_generator_active(generator_id: str, is_active: bool, now_utc: str) -> Optional[tuple[str, bool]]:
+    """
+    Set is_active for a generator with a single conditional UPDATE ... RETURNING.
+    
+    The UPDATE only matches rows whose state actually changes, so the common
+    path is one statement with no SELECT-then-UPDATE race. Only when nothing
+    matched is a lookup needed to tell "already in that state" from "not found".
+    
+    Args:
+        generator_id: Generator to update
+        is_active: Desired active state
+        now_utc: Current UTC timestamp
+    
+    Returns:
+        Tuple of (name, changed), or None if the generator does not exist.
+    """
+    active_value = 1 if is_active else 0
+    
+    with transaction() as cursor:
+        cursor.execute(
+            """
+            UPDATE generators SET is_active = ?, updated_at_utc = ?
+            WHERE generator_id = ? AND is_active <> ?
+            RETURNING name
+            """,
+            (active_value, now_utc, generator_id, active_value)
+        )
+        # fetchall() drains the statement before the transaction commits
+        rows = cursor.fetchall()
+        if not rows:
+            cursor.execute(
+                "SELECT name FROM generators WHERE generator_id = ?",
+                (generator_id,)
+            )
+            row = cursor.fetchone()
+    
+    if rows:
+        invalidate_matchmaking_cache()
+        return rows[0]["name"], True
+    
+    return (row["name"], False) if row else None
+
+
 @app.post("/admin/generators/{generator_id}/disable")
 async def admin_disable_generator(generator_id: str, is_admin: bool = Depends(verify_admin_key)):
     """
@@ -3347,17 +3579,21 @@ async def admin_disable_generator(generator_id: str, is_admin: bool = Depends(ve
     
     Sets is_active = 0 for the specified generator, removing it from battle selection.
     """
-    conn = get_connection()
     now_utc = datetime.now(timezone.utc).isoformat()
     
-    # Check if generator exists
-    cursor = conn.execute(
-        "SELECT generator_id, name, is_active FROM generators WHERE generator_id = ?",
-        (generator_id,)
-    )
-    gen = cursor.fetchone()
+    # Disable generator
+    try:
+        result = _set_generator_active(generator_id, False, now_utc)
+    except Exception as e:
+        logger.error(f"Failed to disable generator '{generator_id}': {e}")
+        raise_api_error(
+            ErrorCode.INTERNAL_ERROR,
+            f"Failed to disable generator: {str(e)}",
+            retryable=True,
+            status_code=500
+        )
     
-    if not gen:
+    if result is None:
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
             f"Generator '{generator_id}' not found",
@@ -3365,40 +3601,26 @@ async def admin_disable_generator(generator_id: str, is_admin: bool = Depends(ve
             status_code=404
         )
     
-    if gen["is_active"] == 0:
+    name, changed = result
+    
+    if not changed:
         return JSONResponse({
             "protocol_version": "arena/v0",
             "message": f"Generator '{generator_id}' is already disabled",
             "generator_id": generator_id,
-            "name": gen["name"],
+            "name": name,
             "is_active": False
         })
     
-    # Disable generator
-    try:
-        with transaction() as cursor:
-            cursor.execute(
-                "UPDATE generators SET is_active = 0, updated_at_utc = ? WHERE generator_id = ?",
-                (now_utc, generator_id)
-            )
-        
-        logger.info(f"Admin: Disabled generator '{generator_id}'")
-        
-        return JSONResponse({
-            "protocol_version": "arena/v0",
-            "message": f"Generator '{generator_id}' has been disabled",
-            "generator_id": generator_id,
-            "name": gen["name"],
-            "is_active": False
-        })
-    except Exception as e:
-        logger.error(f"Failed to disable generator '{generator_id}': {e}")
-        raise_api_error(
-            ErrorCode.INTERNAL_ERROR,
-            f"Failed to disable generator: {str(e)}",
-            retryable=True,
-            status_code=500
-        )
+    logger.info(f"Admin: Disabled generator '{generator_id}'")
+    
+    return JSONResponse({
+        "protocol_version": "arena/v0",
+        "message": f"Generator '{generator_id}' has been disabled",
+        "generator_id": generator_id,
+        "name": name,
+        "is_active": False
+    })
 
 
 @app.post("/admin/generators/{generator_id}/enable")
@@ -3408,17 +3630,21 @@ async def admin_enable_generator(generator_id: str, is_admin: bool = Depends(ver
     
     Sets is_active = 1 for the specified generator, including it in battle selection.
     """
-    conn = get_connection()
     now_utc = datetime.now(timezone.utc).isoformat()
     
-    # Check if generator exists
-    cursor = conn.execute(
-        "SELECT generator_id, name, is_active FROM generators WHERE generator_id = ?",
-        (generator_id,)
-    )
-    gen = cursor.fetchone()
+    # Enable generator
+    try:
+        result = _set_generator_active(generator_id, True, now_utc)
+    except Exception as e:
+        logger.error(f"Failed to enable generator '{generator_id}': {e}")
+        raise_api_error(
+            ErrorCode.INTERNAL_ERROR,
+            f"Failed to enable generator: {str(e)}",
+            retryable=True,
+            status_code=500
+        )
     
-    if not gen:
+    if result is None:
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
             f"Generator '{generator_id}' not found",
@@ -3426,40 +3652,26 @@ async def admin_enable_generator(generator_id: str, is_admin: bool = Depends(ver
             status_code=404
         )
     
-    if gen["is_active"] == 1:
+    name, changed = result
+    
+    if not changed:
         return JSONResponse({
             "protocol_version": "arena/v0",
             "message": f"Generator '{generator_id}' is already enabled",
             "generator_id": generator_id,
-            "name": gen["name"],
+            "name": name,
             "is_active": True
         })
     
-    # Enable generator
-    try:
-        with transaction() as cursor:
-            cursor.execute(
-                "UPDATE generators SET is_active = 1, updated_at_utc = ? WHERE generator_id = ?",
-                (now_utc, generator_id)
-            )
-        
-        logger.info(f"Admin: Enabled generator '{generator_id}'")
-        
-        return JSONResponse({
-            "protocol_version": "arena/v0",
-            "message": f"Generator '{generator_id}' has been enabled",
-            "generator_id": generator_id,
-            "name": gen["name"],
-            "is_active": True
-        })
-    except Exception as e:
-        logger.error(f"Failed to enable generator '{generator_id}': {e}")
-        raise_api_error(
-            ErrorCode.INTERNAL_ERROR,
-            f"Failed to enable generator: {str(e)}",
-            retryable=True,
-            status_code=500
-        )
+    logger.info(f"Admin: Enabled generator '{generator_id}'")
+    
+    return JSONResponse({
+        "protocol_version": "arena/v0",
+        "message": f"Generator '{generator_id}' has been enabled",
+        "generator_id": generator_id,
+        "name": name,
+        "is_active": True
+    })
 
 
 @app.post("/admin/season/reset")
@@ -3472,14 +3684,15 @@ async def admin_reset_season(is_admin: bool = Depends(verify_admin_key)):
     - Clears wins/losses/ties/skips counters
     - DOES NOT delete battles or votes (for audit trail)
     
-    Returns count of generators reset.
+    Returns count of generators reset (rows already at initial values are not rewritten).
     """
     conn = get_connection()
     now_utc = datetime.now(timezone.utc).isoformat()
     
     try:
         with transaction() as cursor:
-            # Reset all ratings
+            # Reset ratings, skipping rows that are already at initial values
+            # so repeated resets don't rewrite unchanged pages
             cursor.execute(
                 """
                 UPDATE ratings 
@@ -3490,18 +3703,30 @@ async def admin_reset_season(is_admin: bool = Depends(verify_admin_key)):
                     ties = 0,
                     skips = 0,
                     updated_at_utc = ?
+                WHERE rating_value <> ?
+                   OR games_played <> 0
+                   OR wins <> 0
+                   OR losses <> 0
+                   OR ties <> 0
+                   OR skips <> 0
                 """,
-                (config.initial_rating, now_utc)
+                (config.initial_rating, now_utc, config.initial_rating)
             )
             
             count = cursor.rowcount
+            
+            cursor.execute("SELECT COUNT(*) as count FROM ratings")
+            total = cursor.fetchone()["count"]
         
-        logger.warning(f"Admin: Season reset - {count} generators reset to {config.initial_rating}")
+        invalidate_matchmaking_cache()
+        
+        logger.warning(f"Admin: Season reset - {count} of {total} generators reset to {config.initial_rating}")
         
         return JSONResponse({
             "protocol_version": "arena/v0",
-            "message": f"Season reset complete. {count} generators reset to rating {config.initial_rating}",
+            "message": f"Season reset complete. {count} of {total} generators reset to rating {config.initial_rating}",
             "generators_reset": count,
+            "generators_total": total,
             "initial_rating": config.initial_rating,
             "note": "Battle and vote history preserved for audit purposes"
         })
@@ -3515,6 +3740,37 @@ async def admin_reset_season(is_admin: bool = Depends(verify_admin_key)):
         )
 
 
+class AGISParamsUpdate(BaseModel):
+    """Partial update of AGIS matchmaking parameters (omitted fields are kept)."""
+    min_games_for_significance: Optional[int] = Field(default=None, ge=1)
+    target_battles_per_pair: Optional[int] = Field(default=None, ge=1)
+    rating_similarity_sigma: Optional[float] = Field(default=None, gt=0)
+    quality_bias_strength: Optional[float] = Field(default=None, ge=0)
+
+
+@app.post("/admin/matchmaking/params")
+async def admin_update_matchmaking_params(
+    update: Optional[AGISParamsUpdate] = None,
+    is_admin: bool = Depends(verify_admin_key)
+):
+    """
+    Retune AGIS matchmaking parameters without a restart.
+    
+    Fields in the body replace the current values; an empty body reloads them
+    from the ARENA_AGIS_* configuration. Takes effect from the next battle.
+    """
+    changes = update.model_dump(exclude_none=True) if update else {}
+    params = set_agis_params(**changes)
+    
+    logger.warning(f"Admin: AGIS parameters set to {params}")
+    
+    return JSONResponse({
+        "protocol_version": "arena/v0",
+        "message": "Matchmaking parameters updated",
+        "params": asdict(params),
+    })
+
+
 @app.post("/admin/sessions/{session_id}/flag")
 async def admin_flag_session(session_id: str, reason: str = None, is_admin: bool = Depends(verify_admin_key)):
     """
@@ -3562,40 +3818,81 @@ async def admin_flag_session(session_id: str, reason: str = None, is_admin: bool
     })
 
 
+def _prune_backups(backup_dir: Path, keep: int) -> int:
+    """
+    Delete all but the `keep` most recent manual backups in backup_dir.
+    
+    Only files named arena_manual_*.sqlite are considered, so scheduled
+    backups from scripts/backup.sh are left to their own rotation.
+    
+    Returns:
+        Number of backup files removed.
+    """
+    with os.scandir(backup_dir) as it:
+        entries = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in it
+            if entry.name.startswith("arena_manual_") and entry.name.endswith(".sqlite")
+        ]
+    
+    entries.sort(reverse=True)
+    
+    removed = 0
+    for _, path in entries[keep:]:
+        try:
+            os.unlink(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    
+    return removed
+
+
+def _do_backup(db_path: Path, backup_path: Path, keep: int) -> int:
+    """
+    Copy the database file to backup_path and prune old manual backups
+    (blocking file I/O).
+    
+    Runs in a worker thread so the event loop keeps serving requests
+    while a large database is copied.
+    
+    Returns:
+        Size of the backup file in bytes.
+    """
+    # Copy database file (backup directory is created at startup)
+    shutil.copy2(db_path, backup_path)
+    backup_size_bytes = backup_path.stat().st_size
+    
+    # Retention: the new backup is the newest file, so it is always kept
+    if keep > 0:
+        try:
+            removed = _prune_backups(backup_path.parent, keep)
+            if removed:
+                logger.info(f"Pruned {removed} old manual backup(s), keeping {keep}")
+        except OSError as e:
+            logger.warning(f"Failed to prune old backups: {e}")
+    
+    return backup_size_bytes
+
+
 @app.post("/admin/backup")
 async def admin_trigger_backup(is_admin: bool = Depends(verify_admin_key)):
     """
     S1-A4: Trigger a manual database backup.
     
-    Copies the SQLite database file to the backup directory.
+    Copies the SQLite database file to the backup directory and keeps only
+    the most recent ARENA_BACKUP_RETENTION manual backups (0 disables pruning).
+    The copy runs in a worker thread to avoid blocking the event loop.
     """
-    import shutil
-    from pathlib import Path
-    
     try:
-        db_path = Path(config.db_path)
-        backup_dir = Path(config.backup_path)
-        
-        if not db_path.exists():
-            raise_api_error(
-                ErrorCode.INTERNAL_ERROR,
-                f"Database file not found: {config.db_path}",
-                retryable=False,
-                status_code=500
-            )
-        
-        # Create backup directory if it doesn't exist
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        
         # Generate backup filename with timestamp
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         backup_filename = f"arena_manual_{timestamp}.sqlite"
-        backup_path = backup_dir / backup_filename
-        
-        # Copy database file
-        shutil.copy2(db_path, backup_path)
+        backup_path = _BACKUP_DIR / backup_filename
         
-        backup_size_bytes = backup_path.stat().st_size
+        backup_size_bytes = await asyncio.to_thread(
+            _do_backup, _DB_PATH, backup_path, config.backup_retention
+        )
         backup_size_mb = backup_size_bytes / (1024 * 1024)
         
         logger.info(f"Admin: Manual backup created - {backup_filename} ({backup_size_mb:.2f} MB)")
@@ -3609,6 +3906,23 @@ async def admin_trigger_backup(is_admin: bool = Depends(verify_admin_key)):
             "backup_size_mb": round(backup_size_mb, 2),
             "timestamp": timestamp
         })
+    except FileNotFoundError as e:
+        # copy2 raises this when the source DB is missing (no separate exists() probe)
+        # or when the backup directory could not be created at startup
+        if e.filename == str(_DB_PATH):
+            raise_api_error(
+                ErrorCode.INTERNAL_ERROR,
+                f"Database file not found: {config.db_path}",
+                retryable=False,
+                status_code=500
+            )
+        logger.error(f"Failed to create backup: {e}")
+        raise_api_error(
+            ErrorCode.INTERNAL_ERROR,
+            f"Failed to create backup: {str(e)}",
+            retryable=True,
+            status_code=500
+        )
     except Exception as e:
         logger.error(f"Failed to create backup: {e}")
         raise_api_error(
@@ -3623,6 +3937,34 @@ async def admin_trigger_backup(is_admin: bool = Depends(verify_admin_key)):
 # Authentication Endpoints (Stage 3)
 # ============================================================================
 
+_AUTH_ME_PREFIX = b'{"protocol_version":"arena/v0","user":'
+
+
+def _auth_user_response(user: User, message: str) -> Response:
+    """Build a login/register response, serialized directly by pydantic-core."""
+    return Response(
+        content=AuthUserResponse(message=message, user=user).model_dump_json(),
+        media_type="application/json",
+    )
+
+
+def _send_claimed_email(kind: str, user_id: str, send: Callable[[str, str], bool], email: str, token: str) -> None:
+    """
+    Send an email whose cooldown was claimed with claim_email_send.
+    
+    Runs as a background task. If the send fails the claim is released, so
+    a resend within the cooldown window actually sends instead of being
+    coalesced into the failed one.
+    """
+    try:
+        sent = send(email, token)
+    except Exception as e:
+        logger.error("Failed to send %s email for user %s: %s", kind, user_id, e)
+        sent = False
+    if not sent:
+        release_email_send(kind, user_id)
+
+
 @app.get("/v1/auth/me")
 async def get_current_user_endpoint(request: Request):
     """
@@ -3630,9 +3972,11 @@ async def get_current_user_endpoint(request: Request):
     
     Returns user info if authenticated, 401 if not.
     """
-    user = get_current_user(request)
+    # Frontends poll this endpoint; the user's JSON is cached with the session
+    session_token = request.cookies.get(SESSION_COOKIE_NAME)
+    user_json = get_session_user_json(session_token) if session_token else None
     
-    if not user:
+    if not user_json:
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
             "Not authenticated",
@@ -3640,17 +3984,11 @@ async def get_current_user_endpoint(request: Request):
             status_code=401
         )
     
-    return JSONResponse({
-        "protocol_version": "arena/v0",
-        "user": {
-            "user_id": user.user_id,
-            "email": user.email,
-            "display_name": user.display_name,
-            "created_at_utc": user.created_at_utc,
-            "last_login_utc": user.last_login_utc,
-            "is_email_verified": user.is_email_verified
-        }
-    })
+    # Static envelope around the pre-serialized user object
+    return Response(
+        content=_AUTH_ME_PREFIX + user_json + b"}",
+        media_type="application/json",
+    )
 
 
 @app.post("/v1/auth/dev-login")
@@ -3669,37 +4007,27 @@ async def dev_login(request: Request, response: Response, body: DevLoginRequest)
             status_code=403
         )
     
+    # Emails are stored lower-cased
+    email = body.email.lower()
+    
     # Check if user exists
-    user = get_user_by_email(body.email)
+    user = get_user_by_email(email)
     
     if not user:
         # Create new user
         user = create_user(
-            email=body.email,
+            email=email,
             display_name=body.display_name,
             google_sub=None
         )
+        session_token = create_session(user.user_id)
     else:
-        # Update last login
-        update_last_login(user.user_id)
-    
-    # Create session
-    session_token = create_session(user.user_id)
+        # Update last login and create session
+        session_token = login_user(user.user_id)
     
-    logger.info(f"Dev login: user_id={user.user_id} email={user.email}")
+    logger.info("Dev login: user_id=%s email=%s", user.user_id, user.email)
     
-    json_response = JSONResponse({
-        "protocol_version": "arena/v0",
-        "message": "Login successful",
-        "user": {
-            "user_id": user.user_id,
-            "email": user.email,
-            "display_name": user.display_name,
-            "created_at_utc": user.created_at_utc,
-            "last_login_utc": user.last_login_utc,
-            "is_email_verified": user.is_email_verified
-        }
-    })
+    json_response = _auth_user_response(user, "Login successful")
     
     # Set cookie on the actual response object being returned
     set_session_cookie(json_response, session_token)
@@ -3721,8 +4049,8 @@ async def google_login(request: Request, response: Response, body: GoogleLoginRe
             status_code=503
         )
     
-    # Verify Google token
-    token_info = verify_google_token(body.credential)
+    # Verify Google token (may fetch signing certs, so keep it off the event loop)
+    token_info = await asyncio.to_thread(verify_google_token, body.credential)
     
     if not token_info:
         raise_api_error(
@@ -3736,45 +4064,22 @@ async def google_login(request: Request, response: Response, body: GoogleLoginRe
     user = get_user_by_google_sub(token_info["google_sub"])
     
     if not user:
-        # Check if user exists by email
-        user = get_user_by_email(token_info["email"])
-        
-        if not user:
-            # Create new user (auto-verified since using Google OAuth)
-            user = create_user(
-                email=token_info["email"],
-                display_name=token_info["name"],
-                google_sub=token_info["google_sub"]
-            )
-        else:
-            # Link Google account to existing user
-            # Mark as verified since they're logging in via Google
-            update_last_login(user.user_id)
-            mark_email_verified(user.user_id)
+        # Create the user, or link Google to an existing account with this
+        # email (auto-verified since using Google OAuth), in one statement
+        user, _ = upsert_google_user(
+            email=token_info["email"],
+            display_name=token_info["name"],
+            google_sub=token_info["google_sub"]
+        )
+        session_token = create_session(user.user_id)
     else:
-        update_last_login(user.user_id)
         # Ensure they're marked as verified (Google users are always verified)
-        if not user.is_email_verified:
-            mark_email_verified(user.user_id)
-    
-    # Create session
-    session_token = create_session(user.user_id)
+        session_token = login_user(user.user_id, mark_verified=not user.is_email_verified)
     
-    logger.info(f"Google login: user_id={user.user_id} email={user.email}")
+    logger.info("Google login: user_id=%s email=%s", user.user_id, user.email)
     
     # Google OAuth users are always verified
-    json_response = JSONResponse({
-        "protocol_version": "arena/v0",
-        "message": "Login successful",
-        "user": {
-            "user_id": user.user_id,
-            "email": user.email,
-            "display_name": user.display_name,
-            "created_at_utc": user.created_at_utc,
-            "last_login_utc": user.last_login_utc,
-            "is_email_verified": True  # Google OAuth users are always verified
-        }
-    })
+    json_response = _auth_user_response(user.model_copy(update={"is_email_verified": True}), "Login successful")
     
     # Set cookie on the actual response object being returned
     set_session_cookie(json_response, session_token)
@@ -3782,7 +4087,7 @@ async def google_login(request: Request, response: Response, body: GoogleLoginRe
 
 
 @app.post("/v1/auth/register")
-async def email_register(request: Request, response: Response, body: EmailRegisterRequest):
+async def email_register(request: Request, response: Response, body: EmailRegisterRequest, background_tasks: BackgroundTasks):
     """
     Register a new user with email and password.
     
@@ -3798,8 +4103,8 @@ async def email_register(request: Request, response: Response, body: EmailRegist
             status_code=400
         )
     
-    # Validate email format (basic check)
-    if not body.email or '@' not in body.email or len(body.email) < 5:
+    # Validate email format
+    if not is_valid_email(body.email):
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
             "Invalid email address",
@@ -3807,8 +4112,11 @@ async def email_register(request: Request, response: Response, body: EmailRegist
             status_code=400
         )
     
+    # Emails are stored lower-cased
+    email = body.email.lower()
+    
     # Check if email already exists
-    existing_user = get_user_by_email(body.email.lower())
+    existing_user = get_user_by_email(email)
     if existing_user:
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
@@ -3818,38 +4126,26 @@ async def email_register(request: Request, response: Response, body: EmailRegist
         )
     
     # Create user with hashed password
-    password_hash = hash_password(body.password)
+    password_hash = await asyncio.to_thread(hash_password, body.password)
     user = create_user(
-        email=body.email.lower(),
-        display_name=body.display_name or body.email.split('@')[0],
+        email=email,
+        display_name=body.display_name or email.split('@')[0],
         password_hash=password_hash
     )
     
-    # Send verification email
+    # Send verification email after the response is flushed (failures are logged)
+    claim_email_send("verification", user.user_id)
     verification_token = create_email_verification_token(user.user_id)
-    email_sent = send_verification_email(body.email.lower(), verification_token)
-    
-    if not email_sent:
-        logger.warning(f"Failed to send verification email for user {user.user_id}")
+    background_tasks.add_task(
+        _send_claimed_email, "verification", user.user_id, send_verification_email, email, verification_token
+    )
     
     # Create session
     session_token = create_session(user.user_id)
     
-    logger.info(f"Email registration: user_id={user.user_id} email={user.email}")
+    logger.info("Email registration: user_id=%s email=%s", user.user_id, user.email)
     
-    json_response = JSONResponse({
-        "protocol_version": "arena/v0",
-        "message": "Registration successful. Please check your email to verify your account.",
-        "user": {
-            "user_id": user.user_id,
-            "email": user.email,
-            "display_name": user.display_name,
-            "created_at_utc": user.created_at_utc,
-            "last_login_utc": user.last_login_utc,
-            "is_email_verified": user.is_email_verified,
-            "is_email_verified": user.is_email_verified
-        }
-    })
+    json_response = _auth_user_response(user, "Registration successful. Please check your email to verify your account.")
     
     set_session_cookie(json_response, session_token)
     return json_response
@@ -3862,8 +4158,14 @@ async def email_login(request: Request, response: Response, body: EmailLoginRequ
     
     Authenticates the user and creates a new session.
     """
-    # Get user by email
-    user = get_user_by_email(body.email.lower())
+    # Get user and password hash by email (one query)
+    user, password_hash = get_user_with_password_hash_by_email(body.email.lower())
+    
+    # Always pay for one bcrypt check so response time doesn't reveal
+    # whether the account exists
+    password_ok = await asyncio.to_thread(
+        verify_password, body.password, password_hash or get_dummy_password_hash()
+    )
     
     if not user:
         raise_api_error(
@@ -3873,9 +4175,6 @@ async def email_login(request: Request, response: Response, body: EmailLoginRequ
             status_code=401
         )
     
-    # Get password hash
-    password_hash = get_password_hash_by_email(body.email.lower())
-    
     if not password_hash:
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
@@ -3885,7 +4184,7 @@ async def email_login(request: Request, response: Response, body: EmailLoginRequ
         )
     
     # Verify password
-    if not verify_password(body.password, password_hash):
+    if not password_ok:
         raise_api_error(
             ErrorCode.INVALID_PAYLOAD,
             "Invalid email or password",
@@ -3893,26 +4192,17 @@ async def email_login(request: Request, response: Response, body: EmailLoginRequ
             status_code=401
         )
     
-    # Update last login
-    update_last_login(user.user_id)
+    # Upgrade hashes created with a lower bcrypt cost while we have the password
+    if password_needs_rehash(password_hash):
+        new_hash = await asyncio.to_thread(hash_password, body.password)
+        update_user_password(user.user_id, new_hash)
     
-    # Create session
-    session_token = create_session(user.user_id)
+    # Update last login and create session (one transaction)
+    session_token = login_user(user.user_id)
     
-    logger.info(f"Email login: user_id={user.user_id} email={user.email}")
+    logger.info("Email login: user_id=%s email=%s", user.user_id, user.email)
     
-    json_response = JSONResponse({
-        "protocol_version": "arena/v0",
-        "message": "Login successful",
-        "user": {
-            "user_id": user.user_id,
-            "email": user.email,
-            "display_name": user.display_name,
-            "created_at_utc": user.created_at_utc,
-            "last_login_utc": user.last_login_utc,
-            "is_email_verified": user.is_email_verified
-        }
-    })
+    json_response = _auth_user_response(user, "Login successful")
     
     set_session_cookie(json_response, session_token)
     return json_response
@@ -3958,7 +4248,7 @@ async def verify_email(token: str):
             status_code=400
         )
     
-    logger.info(f"Email verified for user {user_id}")
+    logger.info("Email verified for user %s", user_id)
     
     return JSONResponse({
         "protocol_version": "arena/v0",
@@ -3981,11 +4271,19 @@ async def resend_verification(request: Request):
             "message": "Email already verified"
         })
     
-    # Create new verification token
+    # Coalesce repeated clicks: one email per cooldown window
+    if not claim_email_send("verification", user.user_id):
+        return JSONResponse({
+            "protocol_version": "arena/v0",
+            "message": "Verification email sent"
+        })
+    
+    # Create new verification token (send off the event loop; the result is reported)
     verification_token = create_email_verification_token(user.user_id)
-    email_sent = send_verification_email(user.email, verification_token)
+    email_sent = await asyncio.to_thread(send_verification_email, user.email, verification_token)
     
     if not email_sent:
+        release_email_send("verification", user.user_id)
         raise_api_error(
             ErrorCode.INTERNAL_ERROR,
             "Failed to send verification email. Please try again later.",
@@ -3993,7 +4291,7 @@ async def resend_verification(request: Request):
             status_code=500
         )
     
-    logger.info(f"Verification email resent for user {user.user_id}")
+    logger.info("Verification email resent for user %s", user.user_id)
     
     return JSONResponse({
         "protocol_version": "arena/v0",
@@ -4002,7 +4300,7 @@ async def resend_verification(request: Request):
 
 
 @app.post("/v1/auth/forgot-password")
-async def forgot_password(body: ForgotPasswordRequest):
+async def forgot_password(body: ForgotPasswordRequest, background_tasks: BackgroundTasks):
     """
     Request a password reset email.
     
@@ -4010,21 +4308,26 @@ async def forgot_password(body: ForgotPasswordRequest):
     Always returns success to prevent email enumeration.
     """
     email = body.email.lower()
-    user = get_user_by_email(email)
+    user, password_hash = get_user_with_password_hash_by_email(email)
     
     if user:
         # Check if user has a password (not Google-only)
-        if get_password_hash_by_email(email):
-            # Create reset token and send email
+        if not password_hash:
+            # Google-only account, don't send reset email
+            logger.info("Password reset requested for Google-only account: %s", email)
+        elif claim_email_send("password_reset", user.user_id):
+            # Create reset token; the email is sent after the response is flushed
             reset_token = create_password_reset_token(user.user_id)
-            send_password_reset_email(email, reset_token)
-            logger.info(f"Password reset requested for: {email}")
+            background_tasks.add_task(
+                _send_claimed_email, "password_reset", user.user_id, send_password_reset_email, email, reset_token
+            )
+            logger.info("Password reset requested for: %s", email)
         else:
-            # Google-only account, don't send reset email
-            logger.info(f"Password reset requested for Google-only account: {email}")
+            # A reset email went out within the cooldown window
+            logger.info("Password reset re-requested within cooldown for: %s", email)
     else:
         # Don't reveal whether the email exists
-        logger.info(f"Password reset requested for unknown email: {email}")
+        logger.info("Password reset requested for unknown email: %s", email)
     
     # Always return success to prevent email enumeration
     return JSONResponse({
@@ -4061,7 +4364,7 @@ async def reset_password(body: ResetPasswordRequest):
         )
     
     # Update password
-    new_hash = hash_password(body.new_password)
+    new_hash = await asyncio.to_thread(hash_password, body.new_password)
     if not update_user_password(user_id, new_hash):
         raise_api_error(
             ErrorCode.INTERNAL_ERROR,
@@ -4073,7 +4376,7 @@ async def reset_password(body: ResetPasswordRequest):
     # Mark token as used
     use_password_reset_token(body.token)
     
-    logger.info(f"Password reset successful for user {user_id}")
+    logger.info("Password reset successful for user %s", user_id)
     
     return JSONResponse({
         "protocol_version": "arena/v0",
@@ -4098,11 +4401,12 @@ def require_auth(request: Request) -> User:
     
     # Check email verification (but allow unverified users to access certain endpoints)
     # Google users are auto-verified, so this mainly applies to email/password users
-    if not user.is_email_verified:
+    # Runs on every authenticated request, so skip the debug call unless enabled
+    if not user.is_email_verified and logger.isEnabledFor(logging.DEBUG):
         # For now, we allow unverified users to access the builder profile
         # but they will see a verification notice
         # In the future, you might want to restrict certain actions
-        logger.debug(f"Unverified user accessing endpoint: {user.user_id}")
+        logger.debug("Unverified user accessing endpoint: %s", user.user_id)
     
     return user
 
@@ -4148,7 +4452,7 @@ async def list_my_generators(request: Request):
 
 
 @app.post("/v1/builders/generators")
-@limiter.limit("5/hour")
+@limiter.limit("5/hour", key_func=_user_or_ip_rate_limit_key)
 async def create_generator_endpoint(
     request: Request,
     generator_id: str = None,
@@ -4164,7 +4468,6 @@ async def create_generator_endpoint(
     
     Accepts multipart form data with generator metadata and a ZIP file of levels.
     """
-    from fastapi import Form, File
     user = require_auth(request)
     
     # For multipart forms, we need to handle this differently
@@ -4178,7 +4481,7 @@ async def create_generator_endpoint(
 
 
 @app.post("/v1/builders/generators/upload")
-@limiter.limit("5/hour")
+@limiter.limit("5/hour", key_func=_user_or_ip_rate_limit_key)
 async def upload_generator(
     request: Request,
     generator_id: str = Form(...),
@@ -4246,7 +4549,7 @@ async def upload_generator(
 
 
 @app.put("/v1/builders/generators/{generator_id}/upload")
-@limiter.limit("5/hour")
+@limiter.limit("5/hour", key_func=_user_or_ip_rate_limit_key)
 async def update_generator_endpoint(
     request: Request,
     generator_id: str,
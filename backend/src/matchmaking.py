@@ -22,20 +22,43 @@ import math
 import random
 import logging
 import sqlite3
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, replace
 from typing import List, Tuple, Dict, Optional
 
-from glicko2 import information_gain, match_quality, DEFAULT_RD, MIN_RD, MAX_RD
+from glicko2 import (
+    information_gain_many, match_quality_many,
+    DEFAULT_RD, MIN_RD, MAX_RD
+)
 from config import load_config
 
 logger = logging.getLogger(__name__)
 
-# Load configurable AGIS parameters
-_config = load_config()
-MIN_GAMES_FOR_SIGNIFICANCE = _config.agis_min_games_for_significance
-RATING_SIMILARITY_SIGMA = _config.agis_rating_similarity_sigma
-TARGET_BATTLES_PER_PAIR = _config.agis_target_battles_per_pair
-QUALITY_BIAS_STRENGTH = _config.agis_quality_bias_strength
+
+@dataclass(frozen=True)
+class AGISParams:
+    """Tunable AGIS parameters (ARENA_AGIS_* settings in config)."""
+    min_games_for_significance: int
+    target_battles_per_pair: int
+    rating_similarity_sigma: float
+    quality_bias_strength: float
+
+
+def _load_params() -> AGISParams:
+    """Read AGIS parameters from the current configuration."""
+    config = load_config()
+    return AGISParams(
+        min_games_for_significance=config.agis_min_games_for_significance,
+        target_battles_per_pair=config.agis_target_battles_per_pair,
+        rating_similarity_sigma=config.agis_rating_similarity_sigma,
+        quality_bias_strength=config.agis_quality_bias_strength,
+    )
+
+
+# Active parameters. Replaced wholesale (never mutated) so readers that grab
+# the reference once per call always see a consistent set.
+_params = _load_params()
 
 # Weights for combining pair selection factors
 ALPHA = 0.5  # Rating similarity weight
@@ -43,9 +66,9 @@ BETA = 0.3   # Uncertainty weight
 GAMMA = 0.2  # Coverage weight
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GeneratorStats:
-    """Generator statistics for matchmaking."""
+    """Generator statistics for matchmaking (immutable; cached across battles)."""
     generator_id: str
     rating: float
     rd: float  # Rating deviation
@@ -54,7 +77,7 @@ class GeneratorStats:
     is_active: bool
 
 
-@dataclass  
+@dataclass(slots=True, frozen=True)
 class PairStats:
     """Statistics for a generator pair."""
     gen1_id: str
@@ -65,6 +88,240 @@ class PairStats:
     ties: int
 
 
+class AliasTable:
+    """
+    Walker/Vose alias table for O(1) weighted sampling.
+    
+    Building the table is O(n); each sample afterwards is one randrange
+    plus one random() instead of a scan over all weights.
+    """
+    
+    def __init__(self, weights: List[float]):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.n = n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Leftovers are 1.0 up to floating-point error; prob/alias defaults cover them
+    
+    def sample(self) -> int:
+        """Draw one index with probability proportional to its weight."""
+        i = random.randrange(self.n)
+        return i if random.random() < self.prob[i] else self.alias[i]
+
+
+# Upper bound on how long cached matchmaking inputs are trusted, as a backstop
+# for writes that bypass invalidate_matchmaking_cache() (e.g. offline scripts)
+MATCHMAKING_CACHE_TTL_SECONDS = 60
+
+
+class MatchmakingCache:
+    """
+    In-process cache of the inputs AGIS reads on every battle.
+    
+    Holds the active generator stats, pair battle counts (also as a dense
+    matrix indexed like the generator list), the first-pick alias table,
+    per-first-pick second-pick alias tables and per-generator level ids,
+    so battle creation doesn't
+    have to hit SQLite for tables that only change on votes and admin or
+    builder actions. Every such write calls invalidate(), which bumps
+    version and drops everything; entries are then reloaded lazily.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._loaded_at = 0.0
+        self._generators: Optional[List[GeneratorStats]] = None
+        self._pair_counts: Optional[Dict[Tuple[str, str], int]] = None
+        self._first_pick_table: Optional[AliasTable] = None
+        self._pair_count_matrix: Optional[List[List[int]]] = None
+        self._gen_index: Dict[str, int] = {}
+        self._second_pick_tables: Dict[int, AliasTable] = {}
+        self._level_ids: Dict[str, List[str]] = {}
+    
+    def invalidate(self) -> None:
+        """Drop all cached data; the next reader reloads from the database."""
+        with self._lock:
+            self._clear()
+    
+    def _clear(self) -> None:
+        # Caller holds the lock
+        self.version += 1
+        self._loaded_at = time.monotonic()
+        self._generators = None
+        self._pair_counts = None
+        self._first_pick_table = None
+        self._pair_count_matrix = None
+        self._gen_index = {}
+        self._second_pick_tables = {}
+        self._level_ids = {}
+    
+    def _expire_if_stale(self) -> None:
+        # Caller holds the lock
+        if time.monotonic() - self._loaded_at > MATCHMAKING_CACHE_TTL_SECONDS:
+            self._clear()
+    
+    def set_pair_count(self, pair_key: Tuple[str, str], battle_count: int) -> None:
+        """
+        Record a new battle count for one pair without reloading the epoch.
+        
+        Generator stats and the first-pick table don't depend on pair counts
+        and are kept. The counts dict is replaced rather than mutated, because
+        readers use its identity to decide whether derived data is current.
+        The matrix is patched in place through the generator index, and only
+        the second-pick tables of the two generators involved are dropped.
+        """
+        with self._lock:
+            if self._pair_counts is None:
+                return
+            pair_counts = dict(self._pair_counts)
+            pair_counts[pair_key] = battle_count
+            self.version += 1
+            self._pair_counts = pair_counts
+            
+            i = self._gen_index.get(pair_key[0])
+            j = self._gen_index.get(pair_key[1])
+            if self._pair_count_matrix is not None and i is not None and j is not None:
+                self._pair_count_matrix[i][j] = battle_count
+                self._pair_count_matrix[j][i] = battle_count
+                self._second_pick_tables.pop(i, None)
+                self._second_pick_tables.pop(j, None)
+            elif self._pair_count_matrix is None:
+                self._second_pick_tables = {}
+    
+    def get_generators(self, conn: sqlite3.Connection) -> List[GeneratorStats]:
+        with self._lock:
+            self._expire_if_stale()
+            if self._generators is None:
+                self._generators = get_active_generators_with_stats(conn)
+            return self._generators
+    
+    def get_pair_counts(self, conn: sqlite3.Connection) -> Dict[Tuple[str, str], int]:
+        with self._lock:
+            self._expire_if_stale()
+            if self._pair_counts is None:
+                self._pair_counts = get_pair_counts(conn)
+            return self._pair_counts
+    
+    def get_first_pick_table(self, generators: List[GeneratorStats]) -> AliasTable:
+        with self._lock:
+            # Only reuse the table if it was built from this exact list
+            if self._first_pick_table is None or self._generators is not generators:
+                table = AliasTable(compute_generator_weights(generators))
+                if self._generators is generators:
+                    self._first_pick_table = table
+                return table
+            return self._first_pick_table
+    
+    def get_pair_count_matrix(
+        self,
+        generators: List[GeneratorStats],
+        pair_counts: Dict[Tuple[str, str], int]
+    ) -> List[List[int]]:
+        """
+        Pair battle counts as a symmetric matrix: matrix[i][j] is the count for
+        generators[i] vs generators[j], so a sweep over one generator's
+        opponents reads a single row instead of hashing a tuple key per pair.
+        """
+        with self._lock:
+            # Only reuse the matrix if it was built from this exact list
+            cacheable = self._generators is generators and self._pair_counts is pair_counts
+            if self._pair_count_matrix is not None and cacheable:
+                return self._pair_count_matrix
+            
+            n = len(generators)
+            gen_index = {gen.generator_id: i for i, gen in enumerate(generators)}
+            matrix = [[0] * n for _ in range(n)]
+            for (id1, id2), count in pair_counts.items():
+                i = gen_index.get(id1)
+                j = gen_index.get(id2)
+                if i is not None and j is not None:
+                    matrix[i][j] = count
+                    matrix[j][i] = count
+            
+            if cacheable:
+                self._pair_count_matrix = matrix
+                self._gen_index = gen_index
+            return matrix
+    
+    def get_second_pick_table(
+        self,
+        generators: List[GeneratorStats],
+        pair_counts: Dict[Tuple[str, str], int],
+        i1: int
+    ) -> AliasTable:
+        """
+        Alias table over generators for the second pick when generators[i1]
+        was picked first. Pair weights only depend on the first pick and on
+        epoch data, so each row is computed at most once per epoch.
+        """
+        matrix = self.get_pair_count_matrix(generators, pair_counts)
+        with self._lock:
+            cacheable = self._generators is generators and self._pair_counts is pair_counts
+            table = self._second_pick_tables.get(i1) if cacheable else None
+            if table is None:
+                table = AliasTable(compute_pair_weights(generators[i1], generators, matrix[i1]))
+                if cacheable:
+                    self._second_pick_tables[i1] = table
+            return table
+    
+    def get_level_ids(self, conn: sqlite3.Connection, generator_id: str) -> List[str]:
+        with self._lock:
+            self._expire_if_stale()
+            level_ids = self._level_ids.get(generator_id)
+            if level_ids is None:
+                rows = conn.execute(
+                    "SELECT level_id FROM levels WHERE generator_id = ?",
+                    (generator_id,)
+                ).fetchall()
+                level_ids = [row["level_id"] for row in rows]
+                self._level_ids[generator_id] = level_ids
+            return level_ids
+
+
+_cache = MatchmakingCache()
+
+
+def invalidate_matchmaking_cache() -> None:
+    """Invalidate cached matchmaking data after generators, levels, ratings or pair stats change."""
+    _cache.invalidate()
+
+
+def get_agis_params() -> AGISParams:
+    """Return the AGIS parameters currently in use."""
+    return _params
+
+
+def set_agis_params(**changes) -> AGISParams:
+    """
+    Swap in new AGIS parameters at runtime.
+    
+    Fields not passed keep their current value; with no arguments the
+    parameters are reloaded from configuration. Cached selection tables are
+    invalidated so the next battle uses the new values.
+    """
+    global _params
+    _params = replace(_params, **changes) if changes else _load_params()
+    _cache.invalidate()
+    logger.info(f"AGIS parameters updated: {_params}")
+    return _params
+
+
 def get_active_generators_with_stats(conn: sqlite3.Connection) -> List[GeneratorStats]:
     """
     Get all active generators with their rating statistics.
@@ -83,7 +340,7 @@ def get_active_generators_with_stats(conn: sqlite3.Connection) -> List[Generator
         FROM generators g
         LEFT JOIN ratings r ON g.generator_id = r.generator_id
         WHERE g.is_active = 1
-        AND EXISTS (SELECT 1 FROM levels l WHERE l.generator_id = g.generator_id)
+        AND g.generator_id IN (SELECT generator_id FROM levels)
         """
     )
     
@@ -120,97 +377,99 @@ def get_pair_counts(conn: sqlite3.Connection) -> Dict[Tuple[str, str], int]:
     return pair_counts
 
 
-def normalize_pair_key(id1: str, id2: str) -> Tuple[str, str]:
-    """Ensure pair key is in canonical order (gen1 < gen2)."""
-    if id1 < id2:
-        return (id1, id2)
-    return (id2, id1)
-
-
-def compute_generator_weight(gen: GeneratorStats, n_generators: int) -> float:
+def compute_generator_weights(generators: List[GeneratorStats]) -> List[float]:
     """
-    Compute selection weight for a generator as first pick.
+    Compute first-pick selection weights for all generators in one pass.
     
     High weight = more likely to be selected.
     
     Factors:
-    - High RD (uncertain) → higher weight
-    - Few games played → higher weight (boost for new generators)
+    - High RD (uncertain) → higher weight (quadratic boost)
+    - Few games played → higher weight (4x to 1x boost for new generators)
     - After convergence, slight quality bias toward better ratings
+    
+    Per-generator constants (normalization factors, convergence threshold)
+    are hoisted out of the loop.
     """
-    # Base weight from uncertainty (RD)
-    # RD ranges from ~30 (very certain) to 350 (new/uncertain)
-    rd_normalized = (gen.rd - MIN_RD) / (MAX_RD - MIN_RD)
-    uncertainty_weight = (1.0 + rd_normalized) ** 2  # Quadratic boost for uncertain
-    
-    # Games played factor
-    games = gen.games_played
-    
-    if games < MIN_GAMES_FOR_SIGNIFICANCE:
-        # Strong boost for new generators (want to reach significance quickly)
-        convergence_ratio = games / MIN_GAMES_FOR_SIGNIFICANCE
-        games_weight = 3.0 * (1.0 - convergence_ratio) + 1.0  # 4x to 1x
-    else:
-        # After significance, mild quality bias
-        # Normalize rating to [0.8, 1.2] range (assuming 600-1400 typical range)
-        quality_factor = 0.8 + QUALITY_BIAS_STRENGTH * max(0, min(1, (gen.rating - 600) / 800))
-        games_weight = quality_factor
+    params = _params
+    min_games = params.min_games_for_significance
+    quality_bias = params.quality_bias_strength
+    inv_rd_range = 1.0 / (MAX_RD - MIN_RD)
+    inv_min_games = 1.0 / min_games
     
-    total_weight = uncertainty_weight * games_weight
+    weights = []
+    for gen in generators:
+        uncertainty_weight = (1.0 + (gen.rd - MIN_RD) * inv_rd_range) ** 2
+        games = gen.games_played
+        if games < min_games:
+            games_weight = 3.0 * (1.0 - games * inv_min_games) + 1.0
+        else:
+            games_weight = 0.8 + quality_bias * max(0, min(1, (gen.rating - 600) / 800))
+        weights.append(max(0.01, uncertainty_weight * games_weight))
     
-    # Ensure positive weight
-    return max(0.01, total_weight)
+    return weights
 
 
-def compute_pair_weight(
+def compute_pair_weights(
     gen1: GeneratorStats,
-    gen2: GeneratorStats,
-    pair_counts: Dict[Tuple[str, str], int]
-) -> float:
+    generators: List[GeneratorStats],
+    pair_count_row: List[int]
+) -> List[float]:
     """
-    Compute weight for selecting gen2 given gen1 is already selected.
+    Compute second-pick weights for every generator given gen1.
     
     Factors:
     - Rating similarity: Prefer similar ratings (informative matches)
     - Uncertainty: Prefer opponents with high RD
     - Coverage: Boost under-represented pairs
-    """
-    # Rating similarity (Gaussian kernel)
-    rating_diff = abs(gen1.rating - gen2.rating)
-    similarity_weight = math.exp(-(rating_diff ** 2) / (2 * RATING_SIMILARITY_SIGMA ** 2))
-    
-    # Uncertainty of second generator
-    rd_normalized = (gen2.rd - MIN_RD) / (MAX_RD - MIN_RD)
-    uncertainty_weight = 1.0 + rd_normalized
-    
-    # Coverage bonus
-    pair_key = normalize_pair_key(gen1.generator_id, gen2.generator_id)
-    count = pair_counts.get(pair_key, 0)
+    - Information gain and match quality of the pairing
     
-    if count < TARGET_BATTLES_PER_PAIR:
-        # Exponential decay bonus as we approach target
-        coverage_bonus = 2.0 * math.exp(-count / 3.0)
-    else:
-        # Minimal bonus after target reached
-        coverage_bonus = 0.1
-    
-    # Information gain from match
-    info_gain = information_gain(gen1.rd, gen2.rd)
-    
-    # Match quality (prefer balanced matches)
-    quality = match_quality(gen1.rating, gen1.rd, gen2.rating, gen2.rd)
-    
-    # Combine factors
-    base_weight = (
-        ALPHA * similarity_weight +
-        BETA * uncertainty_weight +
-        GAMMA * (info_gain + quality)
-    )
+    gen1 itself gets weight 0. Everything that depends only on gen1 or on
+    the module constants is computed once for the sweep, and information
+    gain and match quality come from the batched glicko2 helpers.
     
-    # Add coverage bonus
-    total_weight = base_weight + coverage_bonus
+    pair_count_row[i] is the number of battles between gen1 and
+    generators[i] (gen1's row of the cached pair count matrix).
+    """
+    gen1_id = gen1.generator_id
+    rating1 = gen1.rating
+    ratings = [gen.rating for gen in generators]
+    rds = [gen.rd for gen in generators]
+    
+    info_gains = information_gain_many(gen1.rd, rds)
+    qualities = match_quality_many(rating1, gen1.rd, ratings, rds)
+    
+    params = _params
+    target_battles = params.target_battles_per_pair
+    inv_rd_range = 1.0 / (MAX_RD - MIN_RD)
+    inv_two_sigma_sq = 1.0 / (2 * params.rating_similarity_sigma ** 2)
+    
+    weights = []
+    for gen, count, info_gain, quality in zip(generators, pair_count_row, info_gains, qualities):
+        if gen.generator_id == gen1_id:
+            weights.append(0)  # Can't pick same generator
+            continue
+        
+        # Rating similarity (Gaussian kernel)
+        similarity_weight = math.exp(-((rating1 - gen.rating) ** 2) * inv_two_sigma_sq)
+        
+        # Uncertainty of second generator
+        uncertainty_weight = 1.0 + (gen.rd - MIN_RD) * inv_rd_range
+        
+        # Coverage bonus
+        if count < target_battles:
+            coverage_bonus = 2.0 * math.exp(-count / 3.0)
+        else:
+            coverage_bonus = 0.1
+        
+        base_weight = (
+            ALPHA * similarity_weight +
+            BETA * uncertainty_weight +
+            GAMMA * (info_gain + quality)
+        )
+        weights.append(max(0.01, base_weight + coverage_bonus))
     
-    return max(0.01, total_weight)
+    return weights
 
 
 def select_generators_agis(conn: sqlite3.Connection) -> Tuple[str, str]:
@@ -227,42 +486,36 @@ def select_generators_agis(conn: sqlite3.Connection) -> Tuple[str, str]:
         ValueError: If fewer than 2 active generators with levels
     """
     # Get all active generators with stats
-    generators = get_active_generators_with_stats(conn)
+    generators = _cache.get_generators(conn)
     
     if len(generators) < 2:
         raise ValueError(f"Need at least 2 active generators, found {len(generators)}")
-    
-    n = len(generators)
-    
+
+    # With exactly two generators the pair is fixed; only the side order is
+    # random, so skip the pair counts and weight tables entirely
+    if len(generators) == 2:
+        gen1, gen2 = generators
+        if random.random() < 0.5:
+            gen1, gen2 = gen2, gen1
+        return gen1.generator_id, gen2.generator_id
+
     # Get pair battle counts
-    pair_counts = get_pair_counts(conn)
+    pair_counts = _cache.get_pair_counts(conn)
     
-    # Step 1: Compute selection weights for each generator
-    weights = [compute_generator_weight(g, n) for g in generators]
+    # Step 1: Compute selection weights for each generator (cached as an
+    # alias table until the generator stats change)
+    alias_table = _cache.get_first_pick_table(generators)
     
     # Step 2: Sample first generator
-    total_weight = sum(weights)
-    probs = [w / total_weight for w in weights]
-    gen1 = random.choices(generators, weights=probs, k=1)[0]
+    i1 = alias_table.sample()
+    gen1 = generators[i1]
     
-    # Step 3: Compute pair weights for second generator
-    pair_weights = []
-    for gen in generators:
-        if gen.generator_id == gen1.generator_id:
-            pair_weights.append(0)  # Can't pick same generator
-        else:
-            pw = compute_pair_weight(gen1, gen, pair_counts)
-            pair_weights.append(pw)
+    # Step 3: Compute pair weights for second generator (cached per first
+    # pick as an alias table; gen1 has weight 0, every other generator >= 0.01)
+    pair_table = _cache.get_second_pick_table(generators, pair_counts, i1)
     
     # Step 4: Sample second generator
-    total_pw = sum(pair_weights)
-    if total_pw == 0:
-        # Fallback: uniform selection among non-gen1
-        eligible = [g for g in generators if g.generator_id != gen1.generator_id]
-        gen2 = random.choice(eligible)
-    else:
-        pair_probs = [pw / total_pw for pw in pair_weights]
-        gen2 = random.choices(generators, weights=pair_probs, k=1)[0]
+    gen2 = generators[pair_table.sample()]
     
     logger.debug(
         f"AGIS selected: gen1={gen1.generator_id} (rating={gen1.rating:.0f}, rd={gen1.rd:.0f}, games={gen1.games_played}) "
@@ -272,11 +525,51 @@ def select_generators_agis(conn: sqlite3.Connection) -> Tuple[str, str]:
     return gen1.generator_id, gen2.generator_id
 
 
+def select_generators_agis_batch(conn: sqlite3.Connection, k: int) -> List[Tuple[str, str]]:
+    """
+    Draw k AGIS pairings at once, for load testing and offline simulation.
+    
+    Equivalent to k calls of select_generators_agis against the same
+    ratings, but the epoch data and first-pick table are fetched once and
+    each second-pick table once per distinct first pick, so every extra
+    pair is just two alias-table samples.
+    
+    Args:
+        conn: Database connection
+        k: Number of pairs to draw
+    
+    Returns:
+        List of (left_generator_id, right_generator_id)
+    
+    Raises:
+        ValueError: If fewer than 2 active generators with levels
+    """
+    generators = _cache.get_generators(conn)
+    
+    if len(generators) < 2:
+        raise ValueError(f"Need at least 2 active generators, found {len(generators)}")
+    
+    pair_counts = _cache.get_pair_counts(conn)
+    first_table = _cache.get_first_pick_table(generators)
+    
+    second_tables: Dict[int, AliasTable] = {}
+    pairs = []
+    for _ in range(k):
+        i1 = first_table.sample()
+        second_table = second_tables.get(i1)
+        if second_table is None:
+            second_table = _cache.get_second_pick_table(generators, pair_counts, i1)
+            second_tables[i1] = second_table
+        pairs.append((generators[i1].generator_id, generators[second_table.sample()].generator_id))
+    
+    return pairs
+
+
 def select_random_level(conn: sqlite3.Connection, generator_id: str) -> Optional[str]:
     """
     Select a random level from a generator.
     
-    Uses uniform random selection (simple but effective for small pools).
+    Uses uniform random selection over the generator's cached level ids.
     
     Args:
         conn: Database connection
@@ -285,17 +578,61 @@ def select_random_level(conn: sqlite3.Connection, generator_id: str) -> Optional
     Returns:
         level_id or None if no levels
     """
-    cursor = conn.execute(
-        """
-        SELECT level_id FROM levels 
-        WHERE generator_id = ? 
-        ORDER BY RANDOM() 
-        LIMIT 1
-        """,
-        (generator_id,)
+    level_ids = _cache.get_level_ids(conn, generator_id)
+    return random.choice(level_ids) if level_ids else None
+
+
+# Upsert for generator_pair_stats; parameters are one _pair_stats_row()
+_PAIR_STATS_UPSERT_SQL = """
+    INSERT INTO generator_pair_stats (
+        gen1_id, gen2_id, battle_count, gen1_wins, gen2_wins, ties, skips, last_battle_utc
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(gen1_id, gen2_id) DO UPDATE SET
+        battle_count = battle_count + excluded.battle_count,
+        gen1_wins = gen1_wins + excluded.gen1_wins,
+        gen2_wins = gen2_wins + excluded.gen2_wins,
+        ties = ties + excluded.ties,
+        skips = skips + excluded.skips,
+        last_battle_utc = excluded.last_battle_utc
+"""
+
+
+# (result, left_is_gen1) -> (gen1_wins, gen2_wins, ties, skips) deltas
+_PAIR_RESULT_DELTAS = {
+    ("LEFT", True): (1, 0, 0, 0),
+    ("LEFT", False): (0, 1, 0, 0),
+    ("RIGHT", True): (0, 1, 0, 0),
+    ("RIGHT", False): (1, 0, 0, 0),
+    ("TIE", True): (0, 0, 1, 0),
+    ("TIE", False): (0, 0, 1, 0),
+    ("SKIP", True): (0, 0, 0, 1),
+    ("SKIP", False): (0, 0, 0, 1),
+}
+_NO_DELTAS = (0, 0, 0, 0)
+
+
+def _pair_stats_row(gen1_id: str, gen2_id: str, result: str, now_utc: str) -> list:
+    """
+    Map one battle result onto a canonical generator_pair_stats row.
+    
+    Returns [gen1, gen2, battle_count, gen1_wins, gen2_wins, ties, skips, last_battle_utc]
+    with gen1 < gen2 and LEFT/RIGHT translated to gen1/gen2 wins.
+    """
+    # Normalize to canonical order; the battle's left generator is gen1_id
+    left_is_gen1 = gen1_id < gen2_id
+    if left_is_gen1:
+        canonical_gen1, canonical_gen2 = gen1_id, gen2_id
+    else:
+        canonical_gen1, canonical_gen2 = gen2_id, gen1_id
+    
+    gen1_win_delta, gen2_win_delta, tie_delta, skip_delta = _PAIR_RESULT_DELTAS.get(
+        (result, left_is_gen1), _NO_DELTAS
     )
-    row = cursor.fetchone()
-    return row["level_id"] if row else None
+    
+    return [
+        canonical_gen1, canonical_gen2,
+        1, gen1_win_delta, gen2_win_delta, tie_delta, skip_delta, now_utc
+    ]
 
 
 def update_pair_stats(
@@ -318,57 +655,51 @@ def update_pair_stats(
     Note: LEFT/RIGHT in result refers to battle positions, not gen1/gen2.
           This function handles the mapping based on which generator was on which side.
     """
-    # Normalize to canonical order
-    if gen1_id < gen2_id:
-        canonical_gen1, canonical_gen2 = gen1_id, gen2_id
-        # gen1 was on left in battle context
-        left_is_gen1 = True
-    else:
-        canonical_gen1, canonical_gen2 = gen2_id, gen1_id
-        # gen2 was on left in battle context
-        left_is_gen1 = False
-    
-    # Determine winner in terms of gen1/gen2
-    gen1_win_delta = 0
-    gen2_win_delta = 0
-    tie_delta = 0
-    skip_delta = 0
-    
-    if result == "LEFT":
-        if left_is_gen1:
-            gen1_win_delta = 1
-        else:
-            gen2_win_delta = 1
-    elif result == "RIGHT":
-        if left_is_gen1:
-            gen2_win_delta = 1
+    row = _pair_stats_row(gen1_id, gen2_id, result, now_utc)
+    cursor.execute(_PAIR_STATS_UPSERT_SQL + " RETURNING battle_count", row)
+    
+    # Patch the cached count from RETURNING instead of invalidating the epoch;
+    # rating changes from the same vote invalidate separately (SKIPs don't)
+    _cache.set_pair_count((row[0], row[1]), cursor.fetchone()[0])
+
+
+def update_pair_stats_batch(
+    cursor: sqlite3.Cursor,
+    updates: List[Tuple[str, str, str, str]]
+) -> int:
+    """
+    Apply many battle results to generator pair statistics at once.
+    
+    Intended for bulk replays and backfills. Results for the same pair are
+    folded together in Python first, then written with a single
+    executemany() of the upsert, so each pair costs one statement
+    execution regardless of how many battles it had.
+    
+    Args:
+        cursor: Database cursor (within transaction)
+        updates: (gen1_id, gen2_id, result, now_utc) tuples, same meaning
+                 as the update_pair_stats() arguments
+    
+    Returns:
+        Number of distinct pairs written
+    """
+    rows: Dict[Tuple[str, str], list] = {}
+    for gen1_id, gen2_id, result, now_utc in updates:
+        row = _pair_stats_row(gen1_id, gen2_id, result, now_utc)
+        key = (row[0], row[1])
+        existing = rows.get(key)
+        if existing is None:
+            rows[key] = row
         else:
-            gen1_win_delta = 1
-    elif result == "TIE":
-        tie_delta = 1
-    elif result == "SKIP":
-        skip_delta = 1
-    
-    # Upsert pair stats
-    cursor.execute(
-        """
-        INSERT INTO generator_pair_stats (
-            gen1_id, gen2_id, battle_count, gen1_wins, gen2_wins, ties, skips, last_battle_utc
-        ) VALUES (?, ?, 1, ?, ?, ?, ?, ?)
-        ON CONFLICT(gen1_id, gen2_id) DO UPDATE SET
-            battle_count = battle_count + 1,
-            gen1_wins = gen1_wins + ?,
-            gen2_wins = gen2_wins + ?,
-            ties = ties + ?,
-            skips = skips + ?,
-            last_battle_utc = ?
-        """,
-        (
-            canonical_gen1, canonical_gen2,
-            gen1_win_delta, gen2_win_delta, tie_delta, skip_delta, now_utc,
-            gen1_win_delta, gen2_win_delta, tie_delta, skip_delta, now_utc
-        )
-    )
+            for i in range(2, 7):
+                existing[i] += row[i]
+            existing[7] = max(existing[7], row[7])
+    
+    if rows:
+        cursor.executemany(_PAIR_STATS_UPSERT_SQL, rows.values())
+        _cache.invalidate()
+    
+    return len(rows)
 
 
 def get_matchmaking_stats(conn: sqlite3.Connection) -> dict:
@@ -377,6 +708,7 @@ def get_matchmaking_stats(conn: sqlite3.Connection) -> dict:
     
     Useful for debugging and monitoring.
     """
+    params = _params
     generators = get_active_generators_with_stats(conn)
     pair_counts = get_pair_counts(conn)
     
@@ -384,13 +716,13 @@ def get_matchmaking_stats(conn: sqlite3.Connection) -> dict:
     n = len(generators)
     total_pairs = n * (n - 1) // 2 if n >= 2 else 0
     covered_pairs = sum(1 for count in pair_counts.values() if count > 0)
-    target_covered = sum(1 for count in pair_counts.values() if count >= TARGET_BATTLES_PER_PAIR)
+    target_covered = sum(1 for count in pair_counts.values() if count >= params.target_battles_per_pair)
     
     # Calculate average RD
     avg_rd = sum(g.rd for g in generators) / n if n > 0 else 0
     
     # Find generators needing more games
-    new_generators = [g for g in generators if g.games_played < MIN_GAMES_FOR_SIGNIFICANCE]
+    new_generators = [g for g in generators if g.games_played < params.min_games_for_significance]
     
     return {
         "total_generators": n,
@@ -401,7 +733,9 @@ def get_matchmaking_stats(conn: sqlite3.Connection) -> dict:
         "target_coverage_percent": (target_covered / total_pairs * 100) if total_pairs > 0 else 0,
         "average_rd": avg_rd,
         "new_generators_count": len(new_generators),
-        "target_battles_per_pair": TARGET_BATTLES_PER_PAIR,
-        "min_games_for_significance": MIN_GAMES_FOR_SIGNIFICANCE,
+        "target_battles_per_pair": params.target_battles_per_pair,
+        "min_games_for_significance": params.min_games_for_significance,
+        "rating_similarity_sigma": params.rating_similarity_sigma,
+        "quality_bias_strength": params.quality_bias_strength,
     }
 
@@ -5,9 +5,10 @@ Protocol: arena/v0
 Provides request correlation IDs and logging for all HTTP requests.
 """
 
+import itertools
 import logging
+import os
 import time
-import uuid
 from typing import Callable
 
 from fastapi import Request, Response
@@ -15,13 +16,24 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
+# Request IDs are a per-process random prefix plus a counter: unique within the
+# process, distinguishable across restarts/workers, and no os.urandom() call or
+# UUID formatting per request. They are correlation IDs, not secrets.
+_REQUEST_ID_PREFIX = os.urandom(8).hex()
+_request_counter = itertools.count(1)
+
+
+def _next_request_id() -> str:
+    """Return the next request correlation ID for this process."""
+    return f"{_REQUEST_ID_PREFIX}-{next(_request_counter):012x}"
+
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
     Middleware that assigns a correlation ID to each request and logs request details.
     
     Features:
-    - Generates UUID for each request (request_id)
+    - Generates a unique ID for each request (request_id)
     - Logs: method, path, status_code, duration_ms, request_id
     - Adds X-Request-Id header to response
     - Stores request_id in request.state for use in handlers
@@ -39,57 +51,53 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             Response with X-Request-Id header
         """
         # Generate correlation ID
-        request_id = str(uuid.uuid4())
+        request_id = _next_request_id()
         
         # Store in request state for use in handlers
         request.state.request_id = request_id
         
-        # Record start time
-        start_time = time.time()
+        # Record start time (monotonic, for duration only)
+        start_ns = time.perf_counter_ns()
         
         # Process request
         try:
             response = await call_next(request)
         except Exception as e:
             # If an exception occurs, we still want to log it
-            duration_ms = (time.time() - start_time) * 1000
-            status_code = 500
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             logger.error(
-                f"Request failed: method={request.method} path={request.url.path} "
-                f"status_code={status_code} duration_ms={duration_ms:.2f} "
-                f"request_id={request_id} error={type(e).__name__}: {str(e)}"
+                "Request failed: method=%s path=%s status_code=%d duration_ms=%.2f "
+                "request_id=%s error=%s: %s",
+                request.method, request.url.path, 500, duration_ms,
+                request_id, type(e).__name__, e
             )
             raise
         
         # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-        
-        # Get status code
-        status_code = response.status_code
-        
-        # Extract session_id from request if present (for battles and votes)
-        session_id = None
-        if request.method == "POST":
-            try:
-                # Try to get session_id from request body if it was parsed
-                if hasattr(request.state, "session_id"):
-                    session_id = request.state.session_id
-            except:
-                pass
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
         
         # Log request details (S1-B4: Enhanced with session_id)
-        log_msg = (
-            f"Request: method={request.method} path={request.url.path} "
-            f"status_code={status_code} duration_ms={duration_ms:.2f} "
-            f"request_id={request_id}"
-        )
-        if session_id:
-            log_msg += f" session_id={session_id}"
-        
-        logger.info(log_msg)
+        if logger.isEnabledFor(logging.INFO):
+            # session_id is set on request.state by battle/vote handlers
+            session_id = None
+            if request.method == "POST":
+                session_id = getattr(request.state, "session_id", None)
+            
+            if session_id:
+                logger.info(
+                    "Request: method=%s path=%s status_code=%d duration_ms=%.2f "
+                    "request_id=%s session_id=%s",
+                    request.method, request.url.path, response.status_code, duration_ms,
+                    request_id, session_id
+                )
+            else:
+                logger.info(
+                    "Request: method=%s path=%s status_code=%d duration_ms=%.2f request_id=%s",
+                    request.method, request.url.path, response.status_code, duration_ms,
+                    request_id
+                )
         
         # Add correlation ID to response headers
         response.headers["X-Request-Id"] = request_id
         
         return response
-
@@ -7,9 +7,10 @@ All models match the Stage 0 API specification.
 """
 
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 
 from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
 
 
 # Protocol version constant
@@ -17,6 +18,9 @@ PROTOCOL_VERSION = "arena/v0"
 
 
 # Enums
+# Model fields use the matching Literal types below: pydantic-core checks a
+# Literal with a plain string comparison instead of an enum lookup, and the
+# handlers only use the values as strings. The Enums remain as named constants.
 class VoteResult(str, Enum):
     """Vote result enum."""
     LEFT = "LEFT"
@@ -56,6 +60,12 @@ class Encoding(str, Enum):
     UTF8 = "utf-8"
 
 
+VoteResultValue = Literal["LEFT", "RIGHT", "TIE", "SKIP"]
+PlayOrderValue = Literal["LEFT_THEN_RIGHT"]
+LevelFormatTypeValue = Literal["ASCII_TILEMAP"]
+EncodingValue = Literal["utf-8"]
+
+
 # Request Models
 class BattlePreferences(BaseModel):
     """Battle request preferences (reserved for future use)."""
@@ -70,7 +80,10 @@ class BattleRequest(BaseModel):
     preferences: Optional[BattlePreferences] = Field(default_factory=BattlePreferences, description="Optional preferences")
 
 
-class TrajectoryPoint(BaseModel):
+# Telemetry sample types are TypedDicts rather than models: a vote can carry
+# thousands of samples, and pydantic-core validates TypedDicts without building
+# a model instance per sample. The handlers only ever use them as dicts.
+class TrajectoryPoint(TypedDict):
     """Stage 5: Position sample for trajectory tracking."""
     tick: int
     x: int
@@ -78,7 +91,7 @@ class TrajectoryPoint(BaseModel):
     state: int  # 0=small, 1=large, 2=fire
 
 
-class DeathLocation(BaseModel):
+class DeathLocation(TypedDict):
     """Stage 5: Death location with cause."""
     x: float
     y: float
@@ -86,7 +99,7 @@ class DeathLocation(BaseModel):
     cause: str  # 'enemy', 'fall', 'timeout'
 
 
-class SerializedEvent(BaseModel):
+class SerializedEvent(TypedDict):
     """Stage 5: Serialized game event."""
     type: str
     param: int
@@ -132,7 +145,7 @@ class VoteRequest(BaseModel):
     session_id: str = Field(..., description="Client-generated UUID matching the battle session")
     player_id: Optional[str] = Field(default=None, description="Persistent player ID (Stage 5)")
     battle_id: str = Field(..., description="Battle ID from the battle response")
-    result: VoteResult = Field(..., description="Vote outcome: LEFT, RIGHT, TIE, or SKIP")
+    result: VoteResultValue = Field(..., description="Vote outcome: LEFT, RIGHT, TIE, or SKIP")
     left_tags: Optional[List[str]] = Field(default=None, description="Optional tags describing the left level")
     right_tags: Optional[List[str]] = Field(default=None, description="Optional tags describing the right level")
     telemetry: Optional[Telemetry] = Field(default=None, description="Optional gameplay telemetry")
@@ -149,7 +162,7 @@ class GeneratorInfo(BaseModel):
 
 class LevelFormat(BaseModel):
     """Level format metadata."""
-    type: LevelFormatType = Field(..., description="Format type (ASCII_TILEMAP for Stage 0)")
+    type: LevelFormatTypeValue = Field(..., description="Format type (ASCII_TILEMAP for Stage 0)")
     width: int = Field(..., description="Level width in characters", ge=1, le=250)
     height: int = Field(..., description="Level height in lines (10-20)", ge=10, le=20)
     newline: str = Field(default="\n", description="Newline character used")
@@ -157,7 +170,7 @@ class LevelFormat(BaseModel):
 
 class LevelPayload(BaseModel):
     """Level content payload."""
-    encoding: Encoding = Field(default=Encoding.UTF8, description="Text encoding")
+    encoding: EncodingValue = Field(default=Encoding.UTF8.value, description="Text encoding")
     tilemap: str = Field(..., description="Full ASCII tilemap content (16 lines)")
 
 
@@ -179,7 +192,7 @@ class BattleSide(BaseModel):
 
 class BattlePresentation(BaseModel):
     """Battle presentation instructions."""
-    play_order: PlayOrder = Field(..., description="Order in which levels should be played")
+    play_order: PlayOrderValue = Field(..., description="Order in which levels should be played")
     reveal_generator_names_after_vote: bool = Field(..., description="Whether to reveal generator names after voting")
     suggested_time_limit_seconds: int = Field(..., description="Suggested time limit for playing both levels")
 
@@ -239,11 +252,16 @@ class ErrorResponse(BaseModel):
     
     @classmethod
     def create(cls, code: str, message: str, retryable: bool = False, details: Optional[Dict[str, Any]] = None) -> "ErrorResponse":
-        """Factory method to create a standardized error response."""
-        error_info = ErrorInfo(
+        """
+        Factory method to create a standardized error response.
+        
+        Error bodies are only ever built here from server-side values, so
+        model_construct() skips validation (as for battle and vote responses).
+        """
+        error_info = ErrorInfo.model_construct(
             code=code,
             message=message,
             retryable=retryable,
             details=details
         )
-        return cls(error=error_info)
+        return cls.model_construct(protocol_version=PROTOCOL_VERSION, error=error_info)
@@ -2,15 +2,15 @@
 Test fixtures for PCG Arena backend.
 
 Provides:
-- Temporary SQLite database
+- In-memory SQLite database (shared cache, so every connection sees it)
 - FastAPI test client
 - Seed data import
+- Per-test reset of the database to its seeded state
 """
 
 import os
+import sqlite3
 import sys
-import tempfile
-import shutil
 from pathlib import Path
 
 import pytest
@@ -23,32 +23,30 @@ sys.path.insert(0, str(backend_src))
 @pytest.fixture(scope="session")
 def setup_env():
     """Set up test environment variables."""
-    # Create temp directory for test database
-    temp_dir = tempfile.mkdtemp(prefix="pcg_arena_test_")
-    
     # Get paths relative to project root
     project_root = Path(__file__).parent.parent.parent
     migrations_path = project_root / "db" / "migrations"
     seed_path = project_root / "db" / "seed"
     
-    os.environ["ARENA_DB_PATH"] = str(Path(temp_dir) / "test_arena.sqlite")
+    # Named in-memory DB with a shared cache: the app's startup reconnects by
+    # the same URI and sees the data, and there's no file I/O or fsync
+    os.environ["ARENA_DB_PATH"] = "file:pcg_arena_test?mode=memory&cache=shared"
     os.environ["ARENA_MIGRATIONS_PATH"] = str(migrations_path)
     os.environ["ARENA_SEED_PATH"] = str(seed_path)
     os.environ["ARENA_HOST"] = "127.0.0.1"
     os.environ["ARENA_PORT"] = "8081"
     os.environ["ARENA_DEBUG"] = "true"
-    
-    yield temp_dir
-    
-    # Cleanup
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.environ["ARENA_DEV_AUTH"] = "true"
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def test_db(setup_env):
-    """Initialize test database with migrations and seed data."""
-    temp_dir = setup_env
+    """
+    Initialize test database with migrations and seed data (once per session).
     
+    The connection opened here is held for the whole session: the in-memory
+    database is dropped once its last connection closes.
+    """
     # Import after env is set
     from db import init_connection, run_migrations, import_generators, import_levels, init_generator_ratings, close_connection, get_connection
     from config import load_config
@@ -74,13 +72,19 @@ def test_db(setup_env):
         "ratings_init": ratings_init,
     }
     
-    # Cleanup
+    # Cleanup (closing the last connection discards the database)
     close_connection()
+    conn.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(test_db):
-    """Create test client for FastAPI app using Starlette TestClient."""
+    """
+    Create test client for FastAPI app using Starlette TestClient.
+    
+    Session-scoped like test_db, so app startup (migrations, seed import)
+    runs once; reset_db puts the data back after every test.
+    """
     from starlette.testclient import TestClient
     from main import app
     
@@ -88,3 +92,40 @@ def client(test_db):
     with TestClient(app, raise_server_exceptions=False) as test_client:
         yield test_client
 
+
+@pytest.fixture(scope="session")
+def db_snapshot(client):
+    """Copy of the database as it is after seeding and app startup."""
+    from db import get_connection
+    
+    snapshot = sqlite3.connect(":memory:")
+    get_connection().backup(snapshot)
+    yield snapshot
+    snapshot.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_db(db_snapshot, client):
+    """
+    Restore the seeded database, in-process caches, and client cookies after each test.
+    
+    A per-test SAVEPOINT can't be rolled back here: handlers commit through
+    db.transaction(), and COMMIT releases any enclosing savepoint. Copying
+    the snapshot back with the backup API takes a few milliseconds.
+    """
+    yield
+    
+    from auth import invalidate_auth_caches
+    from db import get_connection
+    from matchmaking import invalidate_matchmaking_cache
+    from stats import invalidate_platform_stats_cache
+    
+    db_snapshot.backup(get_connection())
+    
+    # In-process caches would otherwise still reflect the test's writes
+    invalidate_matchmaking_cache()
+    invalidate_platform_stats_cache()
+    
+    # The client is shared too: sessions from this test must not carry over
+    invalidate_auth_caches()
+    client.cookies.clear()
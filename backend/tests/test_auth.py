@@ -0,0 +1,166 @@
+"""
+Auth tests for PCG Arena backend.
+
+Tests:
+1. verifying an email shows up in /v1/auth/me immediately (session cache)
+2. only the raw session token authenticates, never its stored digest
+3. the dummy password hash is ready before the first login
+4. a failed background email send releases its cooldown
+"""
+
+
+class TestEmailVerification:
+    """Test 1: Email verification invalidates cached sessions."""
+    
+    def test_verified_email_visible_in_auth_me(self, client):
+        """/v1/auth/me reports is_email_verified right after verification."""
+        from auth import create_email_verification_token
+        
+        login_response = client.post("/v1/auth/dev-login", json={
+            "email": "verify-me@example.com",
+            "display_name": "Verify Me",
+        })
+        assert login_response.status_code == 200
+        user_id = login_response.json()["user"]["user_id"]
+        
+        # Populate the session cache with the unverified user
+        me_response = client.get("/v1/auth/me")
+        assert me_response.status_code == 200
+        assert me_response.json()["user"]["is_email_verified"] == False
+        
+        token = create_email_verification_token(user_id)
+        verify_response = client.post(f"/v1/auth/verify-email?token={token}")
+        assert verify_response.status_code == 200
+        
+        me_response = client.get("/v1/auth/me")
+        assert me_response.status_code == 200
+        assert me_response.json()["user"]["is_email_verified"] == True
+
+
+class TestSessionTokenHashing:
+    """Test 2: user_sessions stores digests that cannot be used as cookies."""
+    
+    def test_stored_digest_is_not_a_session_cookie(self, client):
+        """A cookie equal to the stored SHA-256 digest is rejected."""
+        from auth import SESSION_COOKIE_NAME, hash_session_token, invalidate_user_sessions_cache
+        from db import get_connection
+        
+        login_response = client.post("/v1/auth/dev-login", json={
+            "email": "digest-cookie@example.com",
+            "display_name": "Digest Cookie",
+        })
+        assert login_response.status_code == 200
+        user_id = login_response.json()["user"]["user_id"]
+        session_token = client.cookies.get(SESSION_COOKIE_NAME)
+        
+        stored_token = get_connection().execute(
+            "SELECT session_token FROM user_sessions WHERE user_id = ?", (user_id,)
+        ).fetchone()[0]
+        assert stored_token == hash_session_token(session_token)
+        
+        client.cookies.clear()
+        invalidate_user_sessions_cache(user_id)
+        client.cookies.set(SESSION_COOKIE_NAME, stored_token)
+        
+        me_response = client.get("/v1/auth/me")
+        assert me_response.status_code == 401
+        
+        # The digest row is left as it was
+        assert get_connection().execute(
+            "SELECT session_token FROM user_sessions WHERE user_id = ?", (user_id,)
+        ).fetchone()[0] == stored_token
+    
+    def test_legacy_raw_tokens_are_hashed(self, client):
+        """hash_legacy_sessions re-keys raw tokens and keeps them usable."""
+        from auth import (
+            SESSION_COOKIE_NAME, generate_session_token, get_session_expiry,
+            hash_legacy_sessions, hash_session_token,
+        )
+        from db import get_connection, transaction
+        
+        login_response = client.post("/v1/auth/dev-login", json={
+            "email": "legacy-session@example.com",
+            "display_name": "Legacy Session",
+        })
+        user_id = login_response.json()["user"]["user_id"]
+        
+        raw_token = generate_session_token()
+        with transaction() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO user_sessions (session_token, user_id, created_at_utc, expires_at_utc)
+                VALUES (?, ?, ?, ?)
+                """,
+                (raw_token, user_id, "2026-01-01T00:00:00+00:00", get_session_expiry())
+            )
+        
+        assert hash_legacy_sessions() == 1
+        assert hash_legacy_sessions() == 0
+        
+        stored_tokens = {
+            row[0] for row in get_connection().execute(
+                "SELECT session_token FROM user_sessions WHERE user_id = ?", (user_id,)
+            )
+        }
+        assert raw_token not in stored_tokens
+        assert hash_session_token(raw_token) in stored_tokens
+        
+        client.cookies.clear()
+        client.cookies.set(SESSION_COOKIE_NAME, raw_token)
+        me_response = client.get("/v1/auth/me")
+        assert me_response.json()["user"]["user_id"] == user_id
+
+
+class TestDummyPasswordHash:
+    """Test 3: Startup computes the dummy hash used for unknown emails."""
+    
+    def test_dummy_hash_computed_at_calibration(self, client):
+        """The dummy hash exists after startup and matches the calibrated cost."""
+        import auth
+        from auth import password_needs_rehash
+        
+        # Read the stored hash directly: nothing may compute it on demand
+        dummy_hash = auth._dummy_password_hash
+        assert dummy_hash is not None
+        assert dummy_hash.startswith("$2")
+        assert not password_needs_rehash(dummy_hash)
+
+
+class TestEmailSendCooldown:
+    """Test 4: Failed background sends do not hold the email cooldown."""
+    
+    def test_failed_registration_email_allows_resend(self, client):
+        """A resend right after a failed registration email is attempted again."""
+        import auth
+        
+        register_response = client.post("/v1/auth/register", json={
+            "email": "cooldown-register@example.com",
+            "password": "correct horse battery",
+            "display_name": "Cooldown Register",
+        })
+        assert register_response.status_code == 200
+        user_id = register_response.json()["user"]["user_id"]
+        
+        # SendGrid is not configured in tests, so the background send failed
+        assert ("verification", user_id) not in auth._recent_email_sends
+        
+        # The resend is attempted (and fails) instead of being coalesced
+        resend_response = client.post("/v1/auth/resend-verification")
+        assert resend_response.status_code == 500
+    
+    def test_failed_reset_email_releases_cooldown(self, client):
+        """A failed password reset email does not block the next request."""
+        import auth
+        
+        register_response = client.post("/v1/auth/register", json={
+            "email": "cooldown-reset@example.com",
+            "password": "correct horse battery",
+            "display_name": "Cooldown Reset",
+        })
+        user_id = register_response.json()["user"]["user_id"]
+        
+        forgot_response = client.post("/v1/auth/forgot-password", json={
+            "email": "cooldown-reset@example.com",
+        })
+        assert forgot_response.status_code == 200
+        assert ("password_reset", user_id) not in auth._recent_email_sends
@@ -0,0 +1,115 @@
+"""
+Matchmaking tests for PCG Arena backend.
+
+Tests:
+1. batched pair stats updates match repeated single upserts
+2. batched AGIS selection draws valid pairs of active generators
+"""
+
+import itertools
+
+
+def _pair_stats_rows(conn):
+    """All generator_pair_stats rows as plain tuples, in key order."""
+    cursor = conn.execute(
+        """
+        SELECT gen1_id, gen2_id, battle_count, gen1_wins, gen2_wins, ties, skips, last_battle_utc
+        FROM generator_pair_stats
+        ORDER BY gen1_id, gen2_id
+        """
+    )
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+class TestPairStatsBatch:
+    """Test 1: update_pair_stats_batch folds results like sequential upserts."""
+
+    def test_batch_matches_sequential_updates(self, test_db):
+        """Batch and one-by-one updates leave identical pair stats rows."""
+        from db import get_connection, transaction
+        from matchmaking import update_pair_stats, update_pair_stats_batch
+
+        conn = get_connection()
+        gen_a, gen_b, gen_c = [
+            row[0] for row in conn.execute(
+                "SELECT generator_id FROM generators ORDER BY generator_id LIMIT 3"
+            )
+        ]
+
+        # Both orders of each pair, every result, repeated pairs; timestamps
+        # increase so the last battle is also the latest one
+        battles = [
+            (left, right, result)
+            for (left, right), result in itertools.product(
+                [(gen_a, gen_b), (gen_b, gen_a), (gen_c, gen_a), (gen_b, gen_c)],
+                ["LEFT", "RIGHT", "TIE", "SKIP", "LEFT"],
+            )
+        ]
+        updates = [
+            (left, right, result, f"2026-01-01T00:00:{i:02d}+00:00")
+            for i, (left, right, result) in enumerate(battles)
+        ]
+
+        with transaction() as cursor:
+            cursor.execute("DELETE FROM generator_pair_stats")
+            for update in updates:
+                update_pair_stats(cursor, *update)
+        sequential_rows = _pair_stats_rows(conn)
+
+        with transaction() as cursor:
+            cursor.execute("DELETE FROM generator_pair_stats")
+            pairs_written = update_pair_stats_batch(cursor, updates)
+        batch_rows = _pair_stats_rows(conn)
+
+        assert pairs_written == 3
+        assert batch_rows == sequential_rows
+
+        # gen1 < gen2 in every row, and LEFT/RIGHT were mapped onto them
+        assert all(row[0] < row[1] for row in batch_rows)
+        assert sum(row[2] for row in batch_rows) == len(updates)
+
+
+class TestAgisBatchSelection:
+    """Test 2: select_generators_agis_batch returns k valid pairings."""
+
+    def test_zero_pairs(self, test_db):
+        """k=0 draws nothing."""
+        from db import get_connection
+        from matchmaking import select_generators_agis_batch
+
+        assert select_generators_agis_batch(get_connection(), 0) == []
+
+    def test_pairs_are_distinct_active_generators(self, test_db):
+        """Every pair has two different generators, none of them inactive."""
+        from db import get_connection, transaction
+        from matchmaking import invalidate_matchmaking_cache, select_generators_agis_batch
+
+        conn = get_connection()
+        generator_ids = [
+            row[0] for row in conn.execute(
+                """
+                SELECT generator_id FROM generators
+                WHERE is_active = 1 AND generator_id IN (SELECT generator_id FROM levels)
+                ORDER BY generator_id
+                """
+            )
+        ]
+        assert len(generator_ids) >= 4
+
+        # Deactivate all but three, so the N > 2 weighted path is used
+        inactive_ids = set(generator_ids[3:])
+        with transaction() as cursor:
+            cursor.executemany(
+                "UPDATE generators SET is_active = 0 WHERE generator_id = ?",
+                [(generator_id,) for generator_id in inactive_ids]
+            )
+        invalidate_matchmaking_cache()
+
+        k = 200
+        pairs = select_generators_agis_batch(conn, k)
+
+        assert len(pairs) == k
+        for left_id, right_id in pairs:
+            assert left_id != right_id
+            assert left_id not in inactive_ids
+            assert right_id not in inactive_ids
@@ -9,10 +9,53 @@ Tests:
 5. conflicting replay triggers DUPLICATE_VOTE_CONFLICT
 """
 
+import itertools
 import uuid
+from types import SimpleNamespace
+
 import pytest
 
 
+# Sessions only need to be distinct within a test run (the DB is in-memory),
+# not random; the API still requires UUID-formatted session IDs
+_session_counter = itertools.count(1)
+
+
+def _next_session_id() -> str:
+    """Return a fresh UUID-formatted session ID."""
+    return str(uuid.UUID(int=next(_session_counter)))
+
+
+# battles:next body with only the session varying; session IDs are UUIDs, so
+# they can be interpolated into the JSON without escaping
+_BATTLE_REQUEST_TEMPLATE = b'{"client_version":"0.1.0","session_id":"%s"}'
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _post_battle(client, session_id: str):
+    """POST /v1/battles:next for session_id."""
+    return client.post(
+        "/v1/battles:next",
+        content=_BATTLE_REQUEST_TEMPLATE % session_id.encode(),
+        headers=_JSON_HEADERS,
+    )
+
+
+@pytest.fixture
+def battle(client):
+    """Issue a battle for a fresh session; returns its IDs and generators."""
+    session_id = _next_session_id()
+    response = _post_battle(client, session_id)
+    assert response.status_code == 200
+    data = response.json()["battle"]
+    return SimpleNamespace(
+        id=data["battle_id"],
+        session_id=session_id,
+        left=data["left"]["generator"]["generator_id"],
+        right=data["right"]["generator"]["generator_id"],
+    )
+
+
 class TestMigrationsAndSeedImport:
     """Test 1: Migrations and seed import populate expected counts."""
     
@@ -51,12 +94,9 @@ class TestBattleCreation:
     
     def test_battle_creation_returns_valid_response(self, client):
         """Battle creation returns valid response with two levels."""
-        session_id = str(uuid.uuid4())
+        session_id = _next_session_id()
         
-        response = client.post("/v1/battles:next", json={
-            "client_version": "0.1.0",
-            "session_id": session_id,
-        })
+        response = _post_battle(client, session_id)
         
         assert response.status_code == 200
         data = response.json()
@@ -87,55 +127,28 @@ class TestBattleCreation:
         assert "tilemap" in battle["left"]["level_payload"]
         assert "tilemap" in battle["right"]["level_payload"]
     
-    def test_battle_persisted_with_issued_status(self, client):
+    def test_battle_persisted_with_issued_status(self, client, battle):
         """Created battle is persisted with ISSUED status."""
-        session_id = str(uuid.uuid4())
-        
-        # Create battle
-        response = client.post("/v1/battles:next", json={
-            "client_version": "0.1.0",
-            "session_id": session_id,
-        })
-        assert response.status_code == 200
-        battle_id = response.json()["battle"]["battle_id"]
-        
         # Check in debug endpoint
-        debug_response = client.get(f"/debug/battles?status=ISSUED&limit=100")
+        debug_response = client.get(f"/debug/battles/{battle.id}")
         assert debug_response.status_code == 200
-        
-        battles = debug_response.json()["battles"]
-        battle_ids = [b["battle_id"] for b in battles]
-        assert battle_id in battle_ids
+        assert debug_response.json()["battle"]["status"] == "ISSUED"
 
 
 class TestVotingUpdatesRatings:
     """Test 3: Voting updates ratings (LEFT win)."""
     
-    def test_left_win_updates_ratings(self, client):
+    def test_left_win_updates_ratings(self, client, battle):
         """LEFT vote increases left generator rating, decreases right."""
-        session_id = str(uuid.uuid4())
-        
-        # Get initial ratings
-        initial_response = client.get("/v1/leaderboard")
-        initial_data = initial_response.json()
-        initial_ratings = {g["generator_id"]: g["rating"] for g in initial_data["generators"]}
-        
-        # Create battle
-        battle_response = client.post("/v1/battles:next", json={
-            "client_version": "0.1.0",
-            "session_id": session_id,
-        })
-        assert battle_response.status_code == 200
-        battle = battle_response.json()["battle"]
-        battle_id = battle["battle_id"]
-        left_gen_id = battle["left"]["generator"]["generator_id"]
-        right_gen_id = battle["right"]["generator"]["generator_id"]
+        # Get initial ratings (issuing a battle doesn't change them)
+        ratings_url = f"/debug/ratings?ids={battle.left},{battle.right}"
+        initial_ratings = client.get(ratings_url).json()["ratings"]
         
         # Submit LEFT vote
         vote_response = client.post("/v1/votes", json={
             "client_version": "0.1.0",
-            "session_id": session_id,
-            "battle_id": battle_id,
+            "session_id": battle.session_id,
+            "battle_id": battle.id,
             "result": "LEFT",
             "tags": ["fun"],
         })
@@ -145,42 +158,28 @@ class TestVotingUpdatesRatings:
         assert "vote_id" in vote_data
         
         # Check ratings changed
-        final_response = client.get("/v1/leaderboard")
-        final_data = final_response.json()
-        final_ratings = {g["generator_id"]: g["rating"] for g in final_data["generators"]}
+        final_data = client.get(ratings_url).json()
+        final_ratings = final_data["ratings"]
         
         # Left generator should have gained rating
-        assert final_ratings[left_gen_id] > initial_ratings[left_gen_id]
+        assert final_ratings[battle.left] > initial_ratings[battle.left]
         # Right generator should have lost rating
-        assert final_ratings[right_gen_id] < initial_ratings[right_gen_id]
+        assert final_ratings[battle.right] < initial_ratings[battle.right]
         
         # Check games_played incremented
-        for gen in final_data["generators"]:
-            if gen["generator_id"] in (left_gen_id, right_gen_id):
-                assert gen["games_played"] >= 1
+        for gen_id in (battle.left, battle.right):
+            assert final_data["games_played"][gen_id] >= 1
 
 
 class TestIdempotentVoteReplay:
     """Test 4: Idempotent vote replay doesn't double-update."""
     
-    def test_identical_vote_replay_accepted_without_double_update(self, client):
+    def test_identical_vote_replay_accepted_without_double_update(self, client, battle):
         """Replaying identical vote returns same result without double-updating ratings."""
-        session_id = str(uuid.uuid4())
-        
-        # Create battle
-        battle_response = client.post("/v1/battles:next", json={
-            "client_version": "0.1.0",
-            "session_id": session_id,
-        })
-        assert battle_response.status_code == 200
-        battle = battle_response.json()["battle"]
-        battle_id = battle["battle_id"]
-        left_gen_id = battle["left"]["generator"]["generator_id"]
-        
         vote_payload = {
             "client_version": "0.1.0",
-            "session_id": session_id,
-            "battle_id": battle_id,
+            "session_id": battle.session_id,
+            "battle_id": battle.id,
             "result": "RIGHT",
             "tags": ["creative"],
         }
@@ -192,8 +191,8 @@ class TestIdempotentVoteReplay:
         vote_id_1 = vote1_data["vote_id"]
         
         # Get rating after first vote
-        rating1_response = client.get("/v1/leaderboard")
-        rating1 = {g["generator_id"]: g["rating"] for g in rating1_response.json()["generators"]}
+        ratings_url = f"/debug/ratings?ids={battle.left}"
+        rating1 = client.get(ratings_url).json()["ratings"]
         
         # Replay identical vote
         vote2_response = client.post("/v1/votes", json=vote_payload)
@@ -205,33 +204,22 @@ class TestIdempotentVoteReplay:
         assert vote_id_1 == vote_id_2
         
         # Get rating after replay
-        rating2_response = client.get("/v1/leaderboard")
-        rating2 = {g["generator_id"]: g["rating"] for g in rating2_response.json()["generators"]}
+        rating2 = client.get(ratings_url).json()["ratings"]
         
         # Ratings should NOT have changed (no double-update)
-        assert rating1[left_gen_id] == rating2[left_gen_id]
+        assert rating1[battle.left] == rating2[battle.left]
 
 
 class TestConflictingVoteReplay:
     """Test 5: Conflicting replay triggers DUPLICATE_VOTE_CONFLICT."""
     
-    def test_different_payload_for_same_battle_rejected(self, client):
+    def test_different_payload_for_same_battle_rejected(self, client, battle):
         """Submitting different payload for same battle returns conflict error."""
-        session_id = str(uuid.uuid4())
-        
-        # Create battle
-        battle_response = client.post("/v1/battles:next", json={
-            "client_version": "0.1.0",
-            "session_id": session_id,
-        })
-        assert battle_response.status_code == 200
-        battle_id = battle_response.json()["battle"]["battle_id"]
-        
         # First vote: LEFT
         vote1_response = client.post("/v1/votes", json={
             "client_version": "0.1.0",
-            "session_id": session_id,
-            "battle_id": battle_id,
+            "session_id": battle.session_id,
+            "battle_id": battle.id,
             "result": "LEFT",
             "tags": [],
         })
@@ -240,8 +228,8 @@ class TestConflictingVoteReplay:
         # Second vote: RIGHT (different result)
         vote2_response = client.post("/v1/votes", json={
             "client_version": "0.1.0",
-            "session_id": session_id,
-            "battle_id": battle_id,
+            "session_id": battle.session_id,
+            "battle_id": battle.id,
             "result": "RIGHT",
             "tags": [],
         })
@@ -0,0 +1,12 @@
+-- Migration 018: Indexes for debug listing queries
+-- /debug/battles and /debug/votes read the newest rows with
+-- ORDER BY created_at_utc DESC LIMIT ?, optionally filtered by battle status.
+-- These indexes let SQLite walk the index and stop after LIMIT rows instead of
+-- sorting the whole table. votes(created_at_utc) is already covered by
+-- idx_votes_created_at_utc from 002_indexes.sql.
+
+-- /debug/battles?status=...
+CREATE INDEX IF NOT EXISTS idx_battles_status_created ON battles(status, created_at_utc DESC);
+
+-- /debug/battles (no status filter)
+CREATE INDEX IF NOT EXISTS idx_battles_created ON battles(created_at_utc DESC);
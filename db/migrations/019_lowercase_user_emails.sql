@@ -0,0 +1,14 @@
+-- Migration 019: Normalize stored user emails to lower case
+-- New accounts are lower-cased at write time (create_user / upsert_google_user),
+-- so lookups are exact matches on the UNIQUE(email) index.
+-- Older dev/Google accounts may have mixed-case emails; normalize those unless
+-- another account already differs only by case (left for manual review).
+
+UPDATE users
+SET email = lower(email)
+WHERE email <> lower(email)
+  AND NOT EXISTS (
+      SELECT 1 FROM users AS other
+      WHERE lower(other.email) = lower(users.email)
+        AND other.user_id <> users.user_id
+  );
@@ -0,0 +1,11 @@
+-- Migration 020: Covering index for per-generator level id lookups
+-- Matchmaking picks levels with random.choice over a cached list of a
+-- generator's level ids instead of ORDER BY RANDOM() LIMIT 1. Filling that
+-- list (SELECT level_id FROM levels WHERE generator_id = ?) with only
+-- idx_levels_generator_id needs a table lookup per level, pulling in the
+-- tilemap pages; indexing (generator_id, level_id) makes it index-only.
+-- The new index also serves every generator_id lookup, so the old one is dropped.
+
+CREATE INDEX IF NOT EXISTS idx_levels_generator_level ON levels(generator_id, level_id);
+
+DROP INDEX IF EXISTS idx_levels_generator_id;